@@ -12,14 +12,38 @@ from models.researcher import Researcher
 
 
 class Rankable:
+    # the ranked entities are numerous, they do not carry an attribute dict
+    __slots__ = ("internal_rank", "_ranked_researcher")
+
     def __init__(self, internal_rank: float = 0) -> None:
         self.internal_rank = internal_rank
+        # researcher the internal rank was calculated for, None when the rank
+        # has to be (re)calculated
+        self._ranked_researcher = None
 
     def __lt__(self,
                other: "Rankable"):  # Defines sorting order (ascending by
         # internal rank)
         return self.internal_rank < other.internal_rank
 
+    def invalidate_rank(self) -> None:
+        """
+        Mark the internal rank as outdated, e.g. after the entity changed.
+        """
+        self._ranked_researcher = None
+
+    def get_internal_rank(self, researcher: Researcher) -> float:
+        """
+        :returns: internal rank, calculated only if it is not known for the
+        researcher yet or it was invalidated
+        :param researcher: target researcher being verified
+        """
+        if self._ranked_researcher is not researcher:
+            self.calculate_internal_rank(researcher)
+            self._ranked_researcher = researcher
+
+        return self.internal_rank
+
     @abc.abstractmethod
     def calculate_internal_rank(self, researcher: Researcher) -> float:
         """
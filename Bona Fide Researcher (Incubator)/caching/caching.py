@@ -6,17 +6,249 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
+import hashlib
+import json
 import os
+import sqlite3
+import threading
 import time
+from typing import Any, Dict
 
-CACHE_FILE = "api_cache.json"
+CACHE_FILEPATH = "./caching/response_cache.sqlite3"
 CACHE_EXPIRY = 3600  # 1 hour
+CACHE_MAX_SIZE_BYTES = 256 * 1024 * 1024
+# how long (in seconds) the responses of individual data sources stay valid
+SOURCE_CACHE_EXPIRY = {
+    "Crossref": 24 * 3600,
+    "ORCID": 6 * 3600,
+    "EOSC Resource Hub": 12 * 3600,
+    "arXiv": 12 * 3600,
+}
 
 
-def get_cached_data():
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r") as f:
-            cache = json.load(f)
-            if time.time() - cache["timestamp"] < CACHE_EXPIRY:
-                return cache["data"]
-    return None
\ No newline at end of file
+class ResponseCache:
+    """
+    Disk-backed (SQLite) cache of upstream API responses keyed by the data
+    source, the normalized query and the page number. Entries expire after a
+    source-specific TTL and the least recently used entries are evicted once
+    the cache grows over its size limit. The database file can be shared by
+    several processes, the responses are thus stored as JSON (never
+    unpickled).
+    """
+    def __init__(self, filepath: str = CACHE_FILEPATH,
+                 source_expiry: Dict[str, int] = None,
+                 default_expiry: int = CACHE_EXPIRY,
+                 max_size_bytes: int = CACHE_MAX_SIZE_BYTES):
+        self.filepath = filepath
+        self.source_expiry = dict(SOURCE_CACHE_EXPIRY)
+        if source_expiry:
+            self.source_expiry.update(source_expiry)
+        self.default_expiry = default_expiry
+        self.max_size_bytes = max_size_bytes
+
+        self._lock = threading.Lock()
+        self._hits = {}
+        self._misses = {}
+
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(filepath, timeout=30,
+                                           check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "source TEXT NOT NULL, "
+                "value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "last_accessed REAL NOT NULL)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_accessed "
+                "ON responses (last_accessed)")
+
+    @staticmethod
+    def _normalize_query_value(value: Any) -> Any:
+        if isinstance(value, str):
+            return " ".join(value.split()).casefold()
+        return value
+
+    @classmethod
+    def make_key(cls, source: str, query: Any, page: int = 0) -> str:
+        """
+        Build a cache key. Queries differing only in letter case or
+        whitespace share the same key.
+        :param source: name of the data source
+        :param query: query string or a dictionary of query parameters
+        :param page: index of the requested page of results
+        """
+        if isinstance(query, dict):
+            normalized_query = sorted(
+                (str(key), cls._normalize_query_value(value))
+                for key, value in query.items())
+        else:
+            normalized_query = cls._normalize_query_value(query)
+
+        serialized_key = json.dumps([source, normalized_query, page],
+                                    default=str)
+        return hashlib.sha256(serialized_key.encode("utf-8")).hexdigest()
+
+    def _get_expiry(self, source: str) -> int:
+        return self.source_expiry.get(source, self.default_expiry)
+
+    @staticmethod
+    def _count(counter: Dict[str, int], source: str) -> None:
+        counter[source] = counter.get(source, 0) + 1
+
+    def get(self, source: str, query: Any, page: int = 0) -> Any:
+        """
+        :returns: cached response or None if it is missing, expired or not
+        decodable (e.g. stored by an older version)
+        """
+        key = self.make_key(source, query, page)
+        now = time.time()
+
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?",
+                (key,)).fetchone()
+
+            if row is None:
+                self._count(self._misses, source)
+                return None
+
+            value, created_at = row
+            if now - created_at >= self._get_expiry(source):
+                value = None
+            else:
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    value = None
+
+            if value is None:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,))
+                self._count(self._misses, source)
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET last_accessed = ? WHERE key = ?",
+                (now, key))
+            self._count(self._hits, source)
+
+        return value
+
+    def set(self, source: str, query: Any, page: int, value: Any) -> None:
+        """
+        :param value: JSON serializable response
+        """
+        key = self.make_key(source, query, page)
+        serialized_value = json.dumps(value).encode("utf-8")
+        size = len(serialized_value)
+        if size > self.max_size_bytes:
+            return
+
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, source, value, size, created_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, source, serialized_value, size, now, now))
+            self._evict()
+
+    def _evict(self) -> None:
+        # expects the lock to be held by the caller
+        total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        # least recently used entries go first
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_accessed ASC")
+        evicted_keys = []
+        for key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            evicted_keys.append((key,))
+            total_size -= size
+
+        self._connection.executemany("DELETE FROM responses WHERE key = ?",
+                                     evicted_keys)
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def get_stats(self) -> dict:
+        """
+        :returns: hit/miss counters of this process and the current size of
+        the cache
+        """
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) "
+                "FROM responses").fetchone()
+            sources = set(self._hits) | set(self._misses)
+            per_source = {source: {"hits": self._hits.get(source, 0),
+                                   "misses": self._misses.get(source, 0)}
+                          for source in sources}
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0,
+            "sources": per_source,
+            "entries": entries,
+            "size_bytes": size,
+            "max_size_bytes": self.max_size_bytes,
+        }
+
+
+_shared_response_cache = None
+_cache_enabled = True
+_shared_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """
+    :returns: process-wide response cache or None if caching is disabled
+    """
+    global _shared_response_cache
+    if not _cache_enabled:
+        return None
+
+    if _shared_response_cache is None:
+        with _shared_response_cache_lock:
+            if _shared_response_cache is None:
+                _shared_response_cache = ResponseCache()
+
+    return _shared_response_cache
+
+
+def configure_response_cache(enabled: bool = True,
+                             filepath: str = CACHE_FILEPATH,
+                             source_expiry: Dict[str, int] = None,
+                             max_size_bytes: int = CACHE_MAX_SIZE_BYTES) -> (
+        ResponseCache | None):
+    """
+    Replace the shared response cache with one using the given settings.
+    Meant to be called once at startup, before any module issues a request.
+    """
+    global _shared_response_cache, _cache_enabled
+    with _shared_response_cache_lock:
+        _cache_enabled = enabled
+        _shared_response_cache = None
+        if enabled:
+            _shared_response_cache = ResponseCache(
+                filepath, source_expiry, max_size_bytes=max_size_bytes)
+
+    return _shared_response_cache
@@ -0,0 +1,87 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import os
+import tempfile
+import threading
+from typing import Any
+
+
+class RawDataReference:
+    """
+    Reference to a raw payload spilled to a raw data store, it is read from
+    the disk once it is converted to a string (e.g. printed).
+    """
+    __slots__ = ("_store", "_offset", "_size")
+
+    def __init__(self, store: "RawDataStore", offset: int, size: int):
+        self._store = store
+        self._offset = offset
+        self._size = size
+
+    def __str__(self) -> str:
+        return self._store.read(self._offset, self._size)
+
+
+class RawDataStore:
+    """
+    On-disk store of the raw payloads of the data sources for a single job.
+    Payloads are appended to an anonymous temporary file in their printed
+    form, search results hold only the references to them. The payloads are
+    read back only when they are printed (verbose output), the file is
+    removed once the store is closed.
+    """
+    def __init__(self, dirpath: str = None):
+        """
+        :param dirpath: directory of the file, the system temporary directory
+        if empty
+        """
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file = tempfile.TemporaryFile(dir=dirpath)
+        self._size_bytes = 0
+
+    def add(self, raw_data: Any) -> RawDataReference:
+        """
+        Spill the payload to the disk (the modules add payloads concurrently).
+        :returns: reference to the stored payload
+        """
+        serialized_data = str(raw_data).encode("utf-8")
+        with self._lock:
+            offset = self._size_bytes
+            self._file.seek(offset)
+            self._file.write(serialized_data)
+            self._size_bytes += len(serialized_data)
+
+        return RawDataReference(self, offset, len(serialized_data))
+
+    def read(self, offset: int, size: int) -> str:
+        with self._lock:
+            self._file.seek(offset)
+            serialized_data = self._file.read(size)
+
+        return serialized_data.decode("utf-8")
+
+    def get_size(self) -> int:
+        """
+        :returns: size of the stored payloads in bytes
+        """
+        return self._size_bytes
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "RawDataStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
@@ -13,4 +13,6 @@ class JobStatus(Enum):
     RUNNING = 1,
     FINISHED_SUCCESS = 2,
     FINISHED_ERROR = 3,
-    NOT_FOUND = 4
\ No newline at end of file
+    NOT_FOUND = 4,
+    QUEUED = 5,
+    EXPIRED = 6
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import random
+import time
+
+from models.author import Author
+from models.columnar_ranking import ColumnarRankingEngine
+from models.institution import Institution
+from models.researcher import Researcher
+from models.search_results.unified_search_result import UnifiedSearchResult
+
+CANDIDATE_COUNT = 100_000
+ARTICLES_PER_CANDIDATE = 2
+COAUTHOR_COUNT = 2
+INSTITUTION_COUNT = 50
+LIMIT_RESULTS = 10
+LIMIT_ARTICLES = 5
+# how many times the results are ranked (re-scored) for another researcher
+RESEARCHER_COUNT = 5
+RANDOM_SEED = 0
+
+
+def get_researchers():
+    # a new researcher for every ranking, nothing is cached for it
+    return [Researcher("Jana", "Nováková", "jana@example.org",
+                       "0000-0002-1825-0097", f"University {index}")
+            for index in range(RESEARCHER_COUNT)]
+
+
+def create_results():
+    """
+    Candidates with a few articles each, the candidates and their coauthors
+    are affiliated with a limited set of institutions.
+    """
+    random_generator = random.Random(RANDOM_SEED)
+    institution_names = [f"University {index}"
+                         for index in range(INSTITUTION_COUNT)]
+
+    def create_author(given_name, surname):
+        affiliations = {Institution(random_generator.choice(
+            institution_names))}
+        emails = None
+        if random_generator.random() < 0.1:
+            emails = {random_generator.choice(["jana@example.org",
+                                               "other@example.org"])}
+        author = Author(given_name, surname, affiliations, emails)
+        author.name_match_ratio = random_generator.choice(
+            [200, random_generator.uniform(130, 200)])
+        return author
+
+    results = []
+    for candidate_index in range(CANDIDATE_COUNT):
+        author = create_author("Jana", f"Nováková {candidate_index}")
+        articles = []
+        for article_index in range(ARTICLES_PER_CANDIDATE):
+            coauthors = {create_author(f"Given {coauthor_index}",
+                                       f"Surname {coauthor_index}")
+                         for coauthor_index in range(COAUTHOR_COUNT)}
+            articles.append(UnifiedSearchResult(
+                matched_author=author,
+                authors={author, *coauthors},
+                doi=f"10.1234/example.{candidate_index}.{article_index}",
+                urls={f"https://example.org/{candidate_index}/"
+                      f"{article_index}"},
+                title=f"Article {article_index} of {candidate_index}",
+                publishers={"Example Publisher"}))
+        results.append((author, articles))
+
+    return results
+
+
+def rank_objects(results, researcher: Researcher):
+    """
+    Ranking of the models, the way the aggregator ranks and sorts the
+    results.
+    """
+    result_ranks = []
+    for author, articles in results:
+        article_scores = 0
+        for article in articles:
+            article_scores += article.get_internal_rank(researcher)
+        result_ranks.append(author.get_internal_rank(researcher) +
+                            article_scores)
+
+    top_results = sorted(
+        results, key=lambda result: (result[0].perfect_match_attrs_count,
+                                     result[0].internal_rank),
+        reverse=True)[:LIMIT_RESULTS]
+    return [(author, sorted(articles, key=lambda article:
+                            article.internal_rank, reverse=True)[
+                                :LIMIT_ARTICLES])
+            for author, articles in top_results]
+
+
+def rank_columnar(ranking_engine: ColumnarRankingEngine, results,
+                  researcher: Researcher):
+    ranking = ranking_engine.rank(researcher)
+    return [(results[result_index][0],
+             [results[result_index][1][article_index] for article_index in
+              ranking.get_article_order(result_index, LIMIT_ARTICLES)])
+            for result_index in ranking.get_result_order(LIMIT_RESULTS)]
+
+
+def main():
+    results = create_results()
+    print(f"Candidates: {CANDIDATE_COUNT}, articles: "
+          f"{CANDIDATE_COUNT * ARTICLES_PER_CANDIDATE}")
+
+    start = time.perf_counter()
+    object_top_results = [rank_objects(results, researcher)
+                          for researcher in get_researchers()]
+    print(f"Ranking of the models for {RESEARCHER_COUNT} researchers: "
+          f"{time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    ranking_engine = ColumnarRankingEngine(results)
+    layout_time = time.perf_counter() - start
+    columnar_top_results = [rank_columnar(ranking_engine, results,
+                                          researcher)
+                            for researcher in get_researchers()]
+    print(f"Columnar ranking for {RESEARCHER_COUNT} researchers: "
+          f"{time.perf_counter() - start:.2f} s (features laid out in "
+          f"{layout_time:.2f} s)")
+
+    print("Same order of the top results and their articles:",
+          [[(id(author), list(map(id, articles))) for author, articles in
+            top_results] for top_results in object_top_results] ==
+          [[(id(author), list(map(id, articles))) for author, articles in
+            top_results] for top_results in columnar_top_results])
+
+
+if __name__ == '__main__':
+    main()
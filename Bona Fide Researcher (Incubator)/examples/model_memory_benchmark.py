@@ -0,0 +1,111 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import gc
+import random
+import sys
+import tracemalloc
+
+from models.author import Author
+from models.institution import Institution
+from models.researcher import Researcher
+from models.search_results.unified_search_result import UnifiedSearchResult
+from models.search_results_aggregator import SearchResultsAggregator
+
+ARTICLE_COUNT = 10_000
+COAUTHOR_COUNT = 5
+INSTITUTION_COUNT = 50
+DATA_SOURCES = ["Crossref", "ORCID", "EOSC Resource Hub", "arXiv"]
+RANDOM_SEED = 0
+
+
+def get_object_size(obj) -> int:
+    """
+    :returns: size of the object itself and of its attribute dict, if it has
+    one (the attribute values are not included)
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+
+    return size
+
+
+def create_search_results(researcher: Researcher):
+    """
+    Articles of a handful of candidates similar to the target researcher,
+    each with a few coauthors affiliated with a limited set of institutions.
+    """
+    random_generator = random.Random(RANDOM_SEED)
+    institution_names = [f"University {index}"
+                         for index in range(INSTITUTION_COUNT)]
+    candidate_names = [(researcher.given_name, researcher.surname),
+                       (researcher.given_name[0] + ".", researcher.surname),
+                       (researcher.given_name, researcher.surname + "ová")]
+
+    def create_author(given_name, surname):
+        affiliations = {Institution(random_generator.choice(
+            institution_names))}
+        return Author(given_name, surname, affiliations)
+
+    search_results = []
+    for index in range(ARTICLE_COUNT):
+        matched_author = create_author(
+            *random_generator.choice(candidate_names))
+        matched_author.name_match_ratio = random_generator.randint(130, 200)
+        coauthors = {create_author(f"Given{index}-{coauthor_index}",
+                                   f"Surname{index}-{coauthor_index}")
+                     for coauthor_index in range(COAUTHOR_COUNT)}
+        search_results.append(UnifiedSearchResult(
+            matched_author=matched_author,
+            authors={matched_author, *coauthors},
+            doi=f"10.1234/example.{index}",
+            urls={f"https://example.org/articles/{index}"},
+            title=f"Article number {index}",
+            publishers={"Example Publisher"},
+            data_source=random_generator.choice(DATA_SOURCES)))
+
+    return search_results
+
+
+def main():
+    researcher = Researcher("Jana", "Nováková", affiliation="University 1")
+    example_author = Author("Jana", "Nováková")
+    example_institution = Institution("University 1")
+    example_search_result = UnifiedSearchResult(matched_author=example_author)
+
+    print("Object sizes (without the attribute values):")
+    for obj in (example_author, example_institution, example_search_result):
+        print(f"  {type(obj).__name__}: {get_object_size(obj)} B")
+
+    gc.collect()
+    tracemalloc.start()
+    search_results = create_search_results(researcher)
+    gc.collect()
+    models_bytes, _ = tracemalloc.get_traced_memory()
+
+    search_results_aggregator = SearchResultsAggregator(researcher,
+                                                        keep_raw_data=False)
+    search_results_aggregator.add_results(search_results)
+    del search_results
+    gc.collect()
+    aggregated_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    article_count = sum(
+        len(results["articles"]) for results in
+        search_results_aggregator.aggregated_search_results.values())
+    print(f"Aggregated articles: {article_count}")
+    print(f"Memory per search result (with its authors and institutions): "
+          f"{models_bytes / ARTICLE_COUNT:.0f} B")
+    print(f"Memory per aggregated article (including the aggregator "
+          f"indexes): {aggregated_bytes / article_count:.0f} B")
+
+
+if __name__ == '__main__':
+    main()
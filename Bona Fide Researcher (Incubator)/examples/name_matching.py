@@ -20,14 +20,17 @@ class Person:
     def __str__(self):
         return f"{self.given_name_accents} {self.surname_accents} ({self.nationality})"
 
-def main():
-    match_threshold = 65
-
+def get_people():
     czech = Person("Jiří", "Novák", "Jiri", "Novak", "CZ")
     hungarian = Person("Zoltán", "Szabó", "Zoltan", "Szabo", "HU")
     portuguese = Person("João", "Gonçalves", "Joao", "Goncalves", "PT")
 
-    people = [czech, hungarian, portuguese]
+    return [czech, hungarian, portuguese]
+
+def main():
+    match_threshold = 65
+
+    people = get_people()
 
     for person in people:
         name_matcher_certain = NameMatcher(uncertain_name_order=False, match_threshold=match_threshold)
@@ -0,0 +1,106 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import timeit
+
+from examples.name_matching import get_people
+from models.name_matcher import NameMatcher, TargetNameMatcher
+
+MATCH_THRESHOLD = 65
+SCORE_CUTOFF = MATCH_THRESHOLD * 2
+# how many times the candidate list is repeated (simulates a page of authors)
+CANDIDATE_REPEAT_COUNT = 200
+BENCHMARK_RUNS = 20
+
+
+def get_candidate_names(people):
+    """
+    Names of all the people in all the spellings from the name matching
+    example - accented, normalized, initials and swapped name order. Each
+    target is thus matched against its own variants and the other people.
+    """
+    candidate_names = []
+    for person in people:
+        candidate_names.extend([
+            (person.given_name_accents, person.surname_accents),
+            (person.given_name_normalized, person.surname_normalized),
+            (person.surname_accents, person.given_name_accents),
+            (person.surname_normalized, person.given_name_normalized),
+            (person.initial, person.surname_accents),
+            (person.initial, person.surname_normalized),
+            (person.surname_accents, person.initial),
+            (person.surname_normalized, person.initial),
+        ])
+
+    return candidate_names * CANDIDATE_REPEAT_COUNT
+
+
+def match_per_candidate(person, candidate_names, uncertain_name_order):
+    # a new matcher for every candidate, as the modules used to do
+    return [NameMatcher(uncertain_name_order, MATCH_THRESHOLD)
+            .get_name_match_ratio(given_name, surname,
+                                  person.given_name_accents,
+                                  person.surname_accents)
+            for given_name, surname in candidate_names]
+
+
+def match_with_target_matcher(person, candidate_names, uncertain_name_order):
+    name_matcher = TargetNameMatcher(person.given_name_accents,
+                                     person.surname_accents,
+                                     uncertain_name_order, MATCH_THRESHOLD,
+                                     SCORE_CUTOFF)
+    return [name_matcher.get_name_match_ratio(given_name, surname)
+            for given_name, surname in candidate_names]
+
+
+def match_with_target_matcher_batch(person, candidate_names,
+                                    uncertain_name_order):
+    name_matcher = TargetNameMatcher(person.given_name_accents,
+                                     person.surname_accents,
+                                     uncertain_name_order, MATCH_THRESHOLD,
+                                     SCORE_CUTOFF)
+    return name_matcher.get_name_match_ratios(candidate_names)
+
+
+def main():
+    people = get_people()
+    candidate_names = get_candidate_names(people)
+    matching_functions = [match_per_candidate, match_with_target_matcher,
+                          match_with_target_matcher_batch]
+
+    print(f"Candidates per target: {len(candidate_names)}, "
+          f"runs: {BENCHMARK_RUNS}")
+
+    for uncertain_name_order in (False, True):
+        print(f"Uncertain name order: {uncertain_name_order}")
+        baseline_duration = None
+
+        for matching_function in matching_functions:
+            # the scores reaching the cutoff must not change
+            for person in people:
+                expected_scores = [
+                    score if score >= SCORE_CUTOFF else 0
+                    for score in match_per_candidate(person, candidate_names,
+                                                     uncertain_name_order)]
+                scores = [score if score >= SCORE_CUTOFF else 0
+                          for score in matching_function(
+                              person, candidate_names, uncertain_name_order)]
+                assert scores == expected_scores, matching_function.__name__
+
+            duration = timeit.timeit(
+                lambda: [matching_function(person, candidate_names,
+                                           uncertain_name_order)
+                         for person in people],
+                number=BENCHMARK_RUNS)
+            baseline_duration = baseline_duration or duration
+            print(f"  {matching_function.__name__}: {duration:.3f} s "
+                  f"(speedup {baseline_duration / duration:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,8 @@ from typing import Generic, TypeVar
 T = TypeVar('T', bound='IMergeable')
 
 class IMergeable(Generic[T]):
+    __slots__ = ()
+
     @abc.abstractmethod
     def merge_with(self, other: T) -> None:
         """
@@ -0,0 +1,235 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import re
+import zlib
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Tuple
+
+import numpy as np
+from unidecode import unidecode
+
+if TYPE_CHECKING:
+    from models.search_results.unified_search_result import \
+        UnifiedSearchResult
+
+# values the data sources use when the DOI or the title is not known
+MISSING_VALUES = {"", "?"}
+DOI_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/",
+                "http://dx.doi.org/", "doi:")
+NON_ALPHANUMERIC_REGEX = re.compile(r"[^0-9a-z]+")
+NUMBER_REGEX = re.compile(r"[0-9]+")
+
+TITLE_SHINGLE_SIZE = 4
+# titles with a Jaccard similarity of their shingles at least this high are
+# considered the same
+TITLE_SIMILARITY_THRESHOLD = 0.8
+# at most this many articles are kept per title or LSH bucket
+MAX_TITLE_BUCKET_SIZE = 100
+# MinHash signature is split into bands, titles sharing any band become
+# candidates (~98.5 % of the titles at the threshold do)
+MINHASH_BAND_COUNT = 8
+MINHASH_BAND_SIZE = 4
+_MINHASH_PRIME = (1 << 31) - 1
+_minhash_rng = np.random.default_rng(0)
+_MINHASH_A = _minhash_rng.integers(
+    1, _MINHASH_PRIME, MINHASH_BAND_COUNT * MINHASH_BAND_SIZE,
+    dtype=np.uint64)[:, None]
+_MINHASH_B = _minhash_rng.integers(
+    0, _MINHASH_PRIME, MINHASH_BAND_COUNT * MINHASH_BAND_SIZE,
+    dtype=np.uint64)[:, None]
+
+
+def normalize_doi(doi: str | None) -> str:
+    """
+    :returns: casefolded DOI without the resolver prefix, empty string if
+    the DOI is missing
+    """
+    if not doi or doi.strip() in MISSING_VALUES:
+        return ""
+
+    doi = doi.strip().casefold()
+    for doi_prefix in DOI_PREFIXES:
+        if doi.startswith(doi_prefix):
+            return doi[len(doi_prefix):]
+
+    return doi
+
+
+def normalize_title(title: str | None) -> str:
+    """
+    :returns: transliterated and casefolded title with only the alphanumeric
+    words, empty string if the title is missing
+    """
+    if not title or title.strip() in MISSING_VALUES:
+        return ""
+
+    return " ".join(NON_ALPHANUMERIC_REGEX.sub(
+        " ", unidecode(title).casefold()).split())
+
+
+def get_title_shingles(normalized_title: str) -> FrozenSet[str]:
+    """
+    :returns: character n-grams of the normalized title
+    """
+    if len(normalized_title) <= TITLE_SHINGLE_SIZE:
+        return frozenset([normalized_title])
+
+    return frozenset(
+        normalized_title[index:index + TITLE_SHINGLE_SIZE]
+        for index in range(len(normalized_title) - TITLE_SHINGLE_SIZE + 1))
+
+
+def get_title_numbers(normalized_title: str) -> FrozenSet[str]:
+    """
+    :returns: numbers in the normalized title - titles differing only in a
+    year or a volume are similar, but not the same
+    """
+    return frozenset(NUMBER_REGEX.findall(normalized_title))
+
+
+def get_minhash_bands(shingles: FrozenSet[str]) -> List[Tuple]:
+    """
+    :returns: LSH bucket keys of the shingles' MinHash signature
+    """
+    shingle_hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) % _MINHASH_PRIME
+         for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    signature = ((_MINHASH_A * shingle_hashes + _MINHASH_B) %
+                 _MINHASH_PRIME).min(axis=1)
+
+    return [(band_index, *band) for band_index, band in enumerate(
+        signature.reshape(MINHASH_BAND_COUNT, MINHASH_BAND_SIZE).tolist())]
+
+
+def get_jaccard_similarity(shingles: FrozenSet[str],
+                           other_shingles: FrozenSet[str]) -> float:
+    return (len(shingles & other_shingles) /
+            len(shingles | other_shingles))
+
+
+class ArticleIndex:
+    """
+    Identity of the articles coming from all the data sources. Articles are
+    matched by the normalized DOI first. Articles without a DOI fall back to
+    the normalized title - the same title matches right away, similar titles
+    are found through MinHash LSH buckets and confirmed by the Jaccard
+    similarity of their shingles. Titles differing in their numbers (years,
+    volumes) are never the same, nor do they share the buckets. Titles are
+    bucketed separately for the articles with and without a DOI - an article
+    with a DOI can only be the same as one without it, so it never looks at
+    the others. Buckets are capped, a lookup thus never scans all the stored
+    articles. Articles with different DOIs are never matched by their titles
+    (e.g. a preprint and its published version).
+    """
+    def __init__(self,
+                 title_similarity_threshold: float =
+                 TITLE_SIMILARITY_THRESHOLD):
+        self.title_similarity_threshold = title_similarity_threshold
+        # article ID -> normalized DOI ("" if unknown)
+        self._dois: List[str] = []
+        # article ID -> (shingles, numbers) of all the titles of the article
+        self._title_fingerprints: List[
+            List[Tuple[FrozenSet[str], FrozenSet[str]]]] = []
+        self._article_ids_by_doi: Dict[str, int] = {}
+        # (has DOI, title) -> article IDs
+        self._article_ids_by_title: Dict[Tuple, List[int]] = {}
+        # (has DOI, numbers, band index, *band) -> article IDs
+        self._article_ids_by_title_band: Dict[Tuple, List[int]] = {}
+
+    def _is_similar_title(self, article_id: int, shingles: FrozenSet[str],
+                          numbers: FrozenSet[str]) -> bool:
+        return any(title_numbers == numbers and
+                   get_jaccard_similarity(shingles, title_shingles) >=
+                   self.title_similarity_threshold
+                   for title_shingles, title_numbers in
+                   self._title_fingerprints[article_id])
+
+    def _find_by_title(self, doi: str, title: str,
+                       title_bands: List[Tuple], shingles: FrozenSet[str],
+                       numbers: FrozenSet[str]) -> int | None:
+        # articles with a DOI can match only the ones without it
+        searched_doi_flags = (False,) if doi else (False, True)
+        candidate_ids = set()
+        exact_match_ids = set()
+        for has_doi in searched_doi_flags:
+            exact_match_ids.update(
+                self._article_ids_by_title.get((has_doi, title), ()))
+            for title_band in title_bands:
+                candidate_ids.update(self._article_ids_by_title_band.get(
+                    (has_doi, numbers, *title_band), ()))
+        candidate_ids.update(exact_match_ids)
+
+        # the oldest article with a compatible DOI wins
+        for candidate_id in sorted(candidate_ids):
+            candidate_doi = self._dois[candidate_id]
+            if doi and candidate_doi and doi != candidate_doi:
+                continue
+
+            if (candidate_id in exact_match_ids or
+                    self._is_similar_title(candidate_id, shingles, numbers)):
+                return candidate_id
+
+        return None
+
+    @staticmethod
+    def _add_to_bucket(buckets: Dict[Tuple, List[int]], key: Tuple,
+                       article_id: int) -> None:
+        bucket = buckets.setdefault(key, [])
+        # a fingerprint shared by that many titles tells nothing about them
+        if len(bucket) < MAX_TITLE_BUCKET_SIZE and article_id not in bucket:
+            bucket.append(article_id)
+
+    def _register_title(self, article_id: int, title: str,
+                        title_bands: List[Tuple], shingles: FrozenSet[str],
+                        numbers: FrozenSet[str]) -> None:
+        title_fingerprint = (shingles, numbers)
+        if title_fingerprint in self._title_fingerprints[article_id]:
+            return
+
+        self._title_fingerprints[article_id].append(title_fingerprint)
+        has_doi = bool(self._dois[article_id])
+        self._add_to_bucket(self._article_ids_by_title, (has_doi, title),
+                            article_id)
+        for title_band in title_bands:
+            self._add_to_bucket(self._article_ids_by_title_band,
+                                (has_doi, numbers, *title_band), article_id)
+
+    def add(self, article: "UnifiedSearchResult") -> int:
+        """
+        Resolve the article and register its DOI and title.
+        :returns: ID of the article, articles with the same ID are the same
+        work
+        """
+        doi = normalize_doi(article.doi)
+        title = normalize_title(article.title)
+        title_bands = []
+        shingles = numbers = frozenset()
+        if title:
+            shingles = get_title_shingles(title)
+            numbers = get_title_numbers(title)
+            title_bands = get_minhash_bands(shingles)
+
+        article_id = self._article_ids_by_doi.get(doi) if doi else None
+        if article_id is None and title:
+            article_id = self._find_by_title(doi, title, title_bands,
+                                             shingles, numbers)
+
+        if article_id is None:
+            article_id = len(self._dois)
+            self._dois.append(doi)
+            self._title_fingerprints.append([])
+        elif doi and not self._dois[article_id]:
+            self._dois[article_id] = doi
+
+        if doi:
+            self._article_ids_by_doi.setdefault(doi, article_id)
+        if title:
+            self._register_title(article_id, title, title_bands, shingles,
+                                 numbers)
+
+        return article_id
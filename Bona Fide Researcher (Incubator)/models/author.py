@@ -13,63 +13,83 @@ from interfaces.imergeable import IMergeable
 from models.institution import Institution
 from models.researcher import Researcher
 
+# shared by all the attributes without values, it must not be mutated
+_EMPTY_SET = frozenset()
+
 
 class Author(IMergeable["Author"], Rankable):
+    __slots__ = ("given_name", "given_name_alternatives", "surname",
+                 "surname_alternatives", "affiliations", "emails", "orcid",
+                 "orcid_alternatives", "name_match_ratio",
+                 "perfect_match_attrs_count", "rank_breakdown",
+                 "_has_rank_breakdown")
+
+    # rank values shared by all the authors
+    _MAX_NAME_MATCH_RATIO = 200
+    _email_rank_value_presence_multiplier = 0.1
+    _email_rank_value_match_multiplier = 1
+    _email_rank_value_match = 100
+    _orcid_rank_value_presence_multiplier = 0.1
+    _orcid_rank_value_match_multiplier = 1
+    _orcid_rank_value_match = 500
+
     def __init__(self, given_name: str, surname: str,
                  affiliations: Set[Institution] = None, emails: Set[str] = None,
                  orcid: str = "") -> None:
         super().__init__()
-        self._MAX_NAME_MATCH_RATIO = 200
         self.given_name = given_name
-        self.given_name_alternatives = set()
+        # alternatives are rare, the (shared) empty frozenset is replaced by
+        # a set once there is one
+        self.given_name_alternatives = _EMPTY_SET
 
         self.surname = surname
-        self.surname_alternatives = set()
+        self.surname_alternatives = _EMPTY_SET
 
         if not affiliations:
             affiliations = set()
         self.affiliations = affiliations
 
+        # most of the authors have no email
         if not emails:
-            emails = set()
+            emails = _EMPTY_SET
         self.emails = emails
-        self._email_rank_value_presence_multiplier = 0.1
-        self._email_rank_value_match_multiplier = 1
-        self._email_rank_value_match = 100
 
         self.orcid = orcid
-        self._orcid_rank_value_presence_multiplier = 0.1
-        self._orcid_rank_value_match_multiplier = 1
-        self._orcid_rank_value_match = 500
-
-        self.orcid_alternatives = set()
+        self.orcid_alternatives = _EMPTY_SET
 
         self.name_match_ratio = 0
         self.perfect_match_attrs_count = 0
-        self.rank_breakdown = {}
+        # allocated only once a rank breakdown is calculated
+        self.rank_breakdown = None
+        self._has_rank_breakdown = False
 
     def merge_with(self, other: "Author", debug_flag: bool = False) -> None:
         if not self.given_name and other.given_name:
             self.given_name = other.given_name
         elif (self.given_name and other.given_name and self.given_name !=
               other.given_name):
-            self.given_name_alternatives.add(other.given_name)
+            self.given_name_alternatives = {*self.given_name_alternatives,
+                                            other.given_name}
 
         if not self.surname and other.surname:
             self.surname = other.surname
         elif self.surname and other.surname and self.surname != other.surname:
-            self.surname_alternatives.add(other.surname)
+            self.surname_alternatives = {*self.surname_alternatives,
+                                         other.surname}
 
         # TODO - refine this merging, remove/join duplicate institutions
         self.affiliations.update(other.affiliations)
 
-        self.emails.update(other.emails)
+        if other.emails:
+            self.emails = {*self.emails, *other.emails}
 
         if not self.orcid and other.orcid:
             self.orcid = other.orcid
         # should not happen ever
         elif self.orcid and other.orcid and self.orcid != other.orcid:
-            self.orcid_alternatives.add(other.orcid)
+            self.orcid_alternatives = {*self.orcid_alternatives, other.orcid}
+
+        self.invalidate_rank()
 
     def __eq__(self, other):
         if self.orcid and other.orcid:
@@ -107,38 +127,46 @@ class Author(IMergeable["Author"], Rankable):
             "attributes_with_perfect_match": self.perfect_match_attrs_count,
         }
 
+    def get_internal_rank(self, researcher: Researcher) -> float:
+        # a rank calculated without the breakdown is not enough here
+        if not self._has_rank_breakdown:
+            self.invalidate_rank()
+
+        return super().get_internal_rank(researcher)
+
+    def get_coauthor_rank(self, researcher: Researcher) -> float:
+        """
+        :returns: internal rank of the author appearing among the authors of
+        an article, calculated without the rank breakdown nobody sees
+        """
+        if self._ranked_researcher is not researcher:
+            self.calculate_internal_rank(researcher, with_breakdown=False)
+            self._ranked_researcher = researcher
+
+        return self.internal_rank
+
     # TODO - reevaluate rank calculation & rank values
-    def calculate_internal_rank(self, researcher: Researcher) -> float:
+    def calculate_internal_rank(self, researcher: Researcher,
+                                with_breakdown: bool = True) -> float:
         self.internal_rank = 0
         self.perfect_match_attrs_count = 0
 
-        self.rank_breakdown["affiliations"] = {"count": len(self.affiliations),
-                                               "perfect_match": 0
-                                               }
+        affiliations_perfect_match = 0
         affiliations_cumulative_rank = 0
         for affiliation in self.affiliations:
-            affiliation_rank = affiliation.calculate_internal_rank(
-                researcher)
+            # institutions do not change, their ranks are calculated once
+            affiliation_rank = affiliation.get_internal_rank(researcher)
             affiliations_cumulative_rank += affiliation_rank
             if affiliation.has_perfect_match:
-                self.perfect_match_attrs_count += 1
-                self.rank_breakdown["affiliations"]["perfect_match"] += 1
-
-        self.rank_breakdown["affiliations"]["cumulative_rank"] = affiliations_cumulative_rank
-
-        if len(self.affiliations) > 0:
-            self.rank_breakdown["affiliations"]["avg_rank_per_affiliation"] = (
-                round(affiliations_cumulative_rank / len(self.affiliations), 2))
+                affiliations_perfect_match += 1
 
         self.internal_rank += affiliations_cumulative_rank
 
-        self.rank_breakdown["emails"] = {"count": len(self.emails),
-                                         "perfect_match": 0}
+        emails_perfect_match = 0
         emails_cumulative_rank = 0
         for email in self.emails:
             if email == researcher.email:
-                self.perfect_match_attrs_count += 1
-                self.rank_breakdown["emails"]["perfect_match"] += 1
+                emails_perfect_match += 1
                 emails_cumulative_rank += (
                         self._email_rank_value_match_multiplier *
                         self._email_rank_value_match)
@@ -147,21 +175,13 @@ class Author(IMergeable["Author"], Rankable):
                         self._email_rank_value_presence_multiplier *
                         self._email_rank_value_match)
 
-        self.rank_breakdown["emails"][
-            "cumulative_rank"] = emails_cumulative_rank
-
-        if len(self.emails) > 0:
-            self.rank_breakdown["emails"]["avg_rank_per_email"] = (
-                round(emails_cumulative_rank / len(self.emails), 2))
-
         self.internal_rank += emails_cumulative_rank
 
+        orcid_perfect_match = 0
+        orcid_rank = 0
         if self.orcid:
-            self.rank_breakdown["orcid"] = {"rank": 0, "perfect_match": 0}
-            orcid_rank = 0
             if self.orcid == researcher.orcid:
-                self.perfect_match_attrs_count += 1
-                self.rank_breakdown["orcid"]["perfect_match"] += 1
+                orcid_perfect_match += 1
                 orcid_rank += (
                         self._orcid_rank_value_match_multiplier *
                         self._orcid_rank_value_match)
@@ -170,17 +190,47 @@ class Author(IMergeable["Author"], Rankable):
                         self._orcid_rank_value_presence_multiplier *
                         self._orcid_rank_value_match)
 
-            self.rank_breakdown["orcid"]["rank"] = orcid_rank
             self.internal_rank += orcid_rank
 
         self.internal_rank += self.name_match_ratio
 
+        name_perfect_match = 0
+        if self.name_match_ratio == self._MAX_NAME_MATCH_RATIO:
+            name_perfect_match += 1
+
+        self.perfect_match_attrs_count = (
+                affiliations_perfect_match + emails_perfect_match +
+                orcid_perfect_match + name_perfect_match)
+
+        self._has_rank_breakdown = with_breakdown
+        if not with_breakdown:
+            return self.internal_rank
+
+        self.rank_breakdown = {}
+        self.rank_breakdown["affiliations"] = {
+            "count": len(self.affiliations),
+            "perfect_match": affiliations_perfect_match,
+            "cumulative_rank": affiliations_cumulative_rank}
+        if len(self.affiliations) > 0:
+            self.rank_breakdown["affiliations"]["avg_rank_per_affiliation"] = (
+                round(affiliations_cumulative_rank / len(self.affiliations), 2))
+
+        self.rank_breakdown["emails"] = {
+            "count": len(self.emails),
+            "perfect_match": emails_perfect_match,
+            "cumulative_rank": emails_cumulative_rank}
+        if len(self.emails) > 0:
+            self.rank_breakdown["emails"]["avg_rank_per_email"] = (
+                round(emails_cumulative_rank / len(self.emails), 2))
+
+        if self.orcid:
+            self.rank_breakdown["orcid"] = {
+                "rank": orcid_rank,
+                "perfect_match": orcid_perfect_match}
+
         self.rank_breakdown["name"] = {"rank": round(self.name_match_ratio, 2),
                                        "max_value": self._MAX_NAME_MATCH_RATIO,
-                                       "perfect_match": 0}
-        if self.name_match_ratio == self._MAX_NAME_MATCH_RATIO:
-            self.perfect_match_attrs_count += 1
-            self.rank_breakdown["name"]["perfect_match"] += 1
+                                       "perfect_match": name_perfect_match}
 
         self.rank_breakdown[
             "attributes_with_perfect_match"] = self.perfect_match_attrs_count
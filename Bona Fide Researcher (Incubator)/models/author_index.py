@@ -0,0 +1,125 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+from typing import Dict, Hashable, List, Tuple
+
+from models.author import Author
+from utils.name_normalization import get_name_normalizer
+
+ORCID_URL_PREFIX = "orcid.org/"
+
+
+def normalize_orcid(orcid: str) -> str:
+    """
+    :returns: bare ORCID identifier (0000-0002-1825-009X) also for the ORCID
+    URLs, empty string if there is no ORCID
+    """
+    if not orcid:
+        return ""
+
+    orcid = orcid.strip()
+    if ORCID_URL_PREFIX in orcid:
+        orcid = orcid.rsplit(ORCID_URL_PREFIX, 1)[1]
+
+    return orcid.strip("/").upper()
+
+
+class AuthorIndex:
+    """
+    Entity resolution of the authors coming from all the data sources. Each
+    distinct person gets an author ID, authors sharing an ORCID, an email or
+    a normalized name are resolved to the same ID. The IDs are kept in a
+    union-find structure - an author linking two existing IDs (e.g. the ORCID
+    of one and the email of another) unites them. IDs with different ORCIDs
+    are never united, people with the same name but different ORCIDs thus
+    stay apart. Every lookup goes through a few dict accesses only.
+    """
+    def __init__(self):
+        self.name_normalizer = get_name_normalizer()
+        # author ID -> parent author ID, the oldest ID of a group is its root
+        self._parents: List[int] = []
+        # root author ID -> ORCID of the group ("" if unknown)
+        self._orcids: List[str] = []
+        # key (ORCID, email or name) -> author IDs registered with the key
+        self._author_ids_by_key: Dict[Hashable, List[int]] = {}
+
+    def find(self, author_id: int) -> int:
+        """
+        :returns: current ID of the author, IDs united into another one
+        resolve to it
+        """
+        parents = self._parents
+        while parents[author_id] != author_id:
+            # path halving keeps the trees flat
+            parents[author_id] = parents[parents[author_id]]
+            author_id = parents[author_id]
+
+        return author_id
+
+    def _get_keys(self, author: Author, orcid: str) -> List[Tuple]:
+        keys = []
+        if orcid:
+            keys.append(("orcid", orcid))
+
+        for email in author.emails or ():
+            if email:
+                keys.append(("email", email.strip().casefold()))
+
+        if author.given_name or author.surname:
+            keys.append(("name",
+                         self.name_normalizer.normalize(author.given_name),
+                         self.name_normalizer.normalize(author.surname)))
+
+        return keys
+
+    def _get_candidate_ids(self, keys: List[Tuple]) -> List[int]:
+        candidate_ids = set()
+        for key in keys:
+            for author_id in self._author_ids_by_key.get(key, ()):
+                candidate_ids.add(self.find(author_id))
+
+        # the oldest author wins when the author could belong to several
+        # groups with different ORCIDs
+        return sorted(candidate_ids)
+
+    def add(self, author: Author) -> Tuple[int, List[int]]:
+        """
+        Resolve the author and register its keys.
+        :returns: ID of the author and the IDs united into it (they are no
+        longer used)
+        """
+        orcid = normalize_orcid(author.orcid)
+        keys = self._get_keys(author, orcid)
+
+        author_id = None
+        united_author_ids = []
+        for candidate_id in self._get_candidate_ids(keys):
+            candidate_orcid = self._orcids[candidate_id]
+            if orcid and candidate_orcid and orcid != candidate_orcid:
+                continue
+
+            orcid = orcid or candidate_orcid
+            if author_id is None:
+                author_id = candidate_id
+            else:
+                self._parents[candidate_id] = author_id
+                united_author_ids.append(candidate_id)
+
+        if author_id is None:
+            author_id = len(self._parents)
+            self._parents.append(author_id)
+            self._orcids.append(orcid)
+        else:
+            self._orcids[author_id] = orcid
+
+        for key in keys:
+            author_ids = self._author_ids_by_key.setdefault(key, [])
+            if author_id not in author_ids:
+                author_ids.append(author_id)
+
+        return author_id, united_author_ids
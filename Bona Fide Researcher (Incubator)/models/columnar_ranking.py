@@ -0,0 +1,384 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+from itertools import chain
+from operator import attrgetter
+from typing import Collection, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from models.author import Author
+from models.institution import Institution
+from models.rank_memo import get_coauthor_order_key, get_institution_key
+from models.researcher import Researcher
+from models.search_results.unified_search_result import UnifiedSearchResult
+
+
+def _get_owner_indices(collections: List[Collection]) -> np.ndarray:
+    """
+    :returns: index of the owning collection for each item of the collections
+    laid out one after another
+    """
+    item_counts = np.fromiter(map(len, collections), dtype=np.intp,
+                              count=len(collections))
+    return np.repeat(np.arange(len(collections)), item_counts)
+
+
+def _sum_by_owner(owner_indices: np.ndarray, values: np.ndarray,
+                  owner_count: int) -> np.ndarray:
+    # bincount adds the values one by one in their order, the sums are thus
+    # the same as the ones of the Python loops of the models
+    return np.bincount(owner_indices, weights=values, minlength=owner_count)
+
+
+def _get_value_codes(values: List) -> Tuple[np.ndarray, List]:
+    """
+    :returns: index of each value among the distinct values and the distinct
+    values (in the order of their first appearance)
+    """
+    value_codes = {}
+    codes = np.fromiter(
+        (value_codes.setdefault(value, len(value_codes)) for value in values),
+        dtype=np.intp, count=len(values))
+    return codes, list(value_codes)
+
+
+class ColumnarRanking:
+    """
+    Ranks of the aggregated results calculated by the columnar ranking
+    engine, one array item per result (author) and per article.
+    """
+    def __init__(self, author_ranks: np.ndarray,
+                 author_perfect_match_counts: np.ndarray,
+                 result_ranks: np.ndarray, article_ranks: np.ndarray,
+                 article_offsets: np.ndarray):
+        """
+        :param author_ranks: internal ranks of the authors of the results
+        :param author_perfect_match_counts: attributes of the authors of the
+        results matching the researcher perfectly
+        :param result_ranks: ranks of the authors and all their articles
+        :param article_ranks: internal ranks of the articles of all the
+        results, the articles of a result follow each other
+        :param article_offsets: index of the first article of each result
+        (and the article count at the end)
+        """
+        self.author_ranks = author_ranks
+        self.author_perfect_match_counts = author_perfect_match_counts
+        self.result_ranks = result_ranks
+        self.article_ranks = article_ranks
+        self.article_offsets = article_offsets
+        self._article_order = None
+
+    def get_result_order(self, limit: int = -1) -> np.ndarray:
+        """
+        :returns: indices of the results in descending order of their
+        authors' perfect match counts and ranks, only the first `limit` of
+        them if the limit is positive. The sort is stable, ties keep their
+        insertion order (just like the sorting of the aggregator).
+        """
+        result_order = np.lexsort((-self.author_ranks,
+                                   -self.author_perfect_match_counts))
+        if limit > 0:
+            return result_order[:limit]
+
+        return result_order
+
+    def get_article_order(self, result_index: int, limit: int = -1) -> (
+            np.ndarray):
+        """
+        :returns: indices of the articles of the result (within the result)
+        in descending order of their ranks, only the first `limit` of them if
+        the limit is positive
+        """
+        if self._article_order is None:
+            # articles of all the results are sorted at once, grouped by
+            # their result
+            article_result_indices = np.repeat(
+                np.arange(len(self.article_offsets) - 1),
+                np.diff(self.article_offsets))
+            self._article_order = np.lexsort((-self.article_ranks,
+                                              article_result_indices))
+
+        start = self.article_offsets[result_index]
+        end = self.article_offsets[result_index + 1]
+        if 0 < limit < end - start:
+            end = start + limit
+
+        return self._article_order[start:end] - start
+
+
+class ColumnarRankingEngine:
+    """
+    Ranks the aggregated results all at once instead of object by object.
+    The features of the authors (affiliations, emails, ORCIDs, name match
+    ratios) and of the articles (their authors, counts of the DOIs, titles,
+    URLs, ...) are laid out in NumPy arrays once, the ranks are then
+    calculated in vectorized form - only the distinct institutions, emails
+    and ORCIDs are compared with the researcher. The ranks are the same as
+    the ones the models calculate (the values are added up in the same
+    order), so is the order of the results. Meant for the batch jobs and the
+    offline re-scoring of large candidate sets, the models are left
+    untouched.
+    """
+    def __init__(self, results: Sequence[Tuple[Author, Sequence[
+            UnifiedSearchResult]]]):
+        """
+        :param results: aggregated results - the author and its articles
+        """
+        article_lists = [result_articles for _, result_articles in results]
+        articles = list(chain.from_iterable(article_lists))
+        # every author object is ranked once, whether it is the author of a
+        # result, the matched author or a coauthor of an article
+        matched_authors = list(map(attrgetter("matched_author"), articles))
+        author_lists = list(map(attrgetter("authors"), articles))
+        authors_by_id = {id(author): author for author in chain(
+            (author for author, _ in results),
+            filter(None, matched_authors),
+            chain.from_iterable(author_lists))}
+        author_indices = {author_id: author_index for author_index, author_id
+                          in enumerate(authors_by_id)}
+        authors = list(authors_by_id.values())
+        self._lay_out_authors(authors)
+        self._lay_out_articles(articles, matched_authors, author_lists,
+                               author_indices)
+
+        self.result_author_indices = np.fromiter(
+            (author_indices[id(author)] for author, _ in results),
+            dtype=np.intp, count=len(results))
+        self.article_owners = _get_owner_indices(article_lists)
+        self.article_offsets = np.concatenate(
+            ([0], np.cumsum(np.fromiter(map(len, article_lists),
+                                        dtype=np.intp,
+                                        count=len(article_lists)))))
+
+    def _lay_out_authors(self, authors: List[Author]) -> None:
+        self.author_count = len(authors)
+
+        affiliation_sets = list(map(attrgetter("affiliations"), authors))
+        self.affiliation_owners = _get_owner_indices(affiliation_sets)
+        self.affiliations = list(chain.from_iterable(affiliation_sets))
+        # distinct institutions are scored once (by the same key as the rank
+        # memo uses)
+        institution_keys = list(map(get_institution_key, self.affiliations))
+        self.affiliation_codes, distinct_institution_keys = _get_value_codes(
+            institution_keys)
+        # the first variant of an institution is scored, as in the rank memo
+        institutions_by_key = {}
+        for institution_key, institution in zip(institution_keys,
+                                                self.affiliations):
+            institutions_by_key.setdefault(institution_key, institution)
+        self.institutions = [institutions_by_key[institution_key]
+                             for institution_key in distinct_institution_keys]
+
+        email_sets = list(map(attrgetter("emails"), authors))
+        self.email_owners = _get_owner_indices(email_sets)
+        self.email_codes, self.emails = _get_value_codes(
+            list(chain.from_iterable(email_sets)))
+
+        orcids = list(map(attrgetter("orcid"), authors))
+        self.has_orcid = np.fromiter(map(bool, orcids), dtype=bool,
+                                     count=self.author_count)
+        self.orcid_codes, self.orcids = _get_value_codes(orcids)
+
+        self.name_match_ratios = np.fromiter(
+            map(attrgetter("name_match_ratio"), authors), dtype=np.float64,
+            count=self.author_count)
+
+    def _lay_out_articles(self, articles: List[UnifiedSearchResult],
+                          matched_authors: List[Author],
+                          author_lists: List[Collection[Author]],
+                          author_indices: Dict[int, int]) -> None:
+        self.article_count = len(articles)
+
+        self.matched_author_owners = np.flatnonzero(np.fromiter(
+            map(bool, matched_authors), dtype=bool, count=self.article_count))
+        self.matched_author_indices = np.fromiter(
+            (author_indices[id(author)] for author in
+             filter(None, matched_authors)), dtype=np.intp,
+            count=len(self.matched_author_owners))
+
+        # all the authors of the articles in their iteration order
+        self.article_author_counts = np.fromiter(
+            map(len, author_lists), dtype=np.intp, count=self.article_count)
+        self.article_author_owners = np.repeat(
+            np.arange(self.article_count), self.article_author_counts)
+        self.article_author_indices = np.fromiter(
+            (author_indices[id(author)] for author in
+             chain.from_iterable(author_lists)), dtype=np.intp,
+            count=len(self.article_author_owners))
+        self.article_author_positions = self._get_coauthor_positions(
+            author_lists)
+
+        # counts of the attributes whose presence is rewarded, in the order
+        # in which the article rewards them
+        self.attribute_counts = np.array([
+            np.fromiter(counts, dtype=np.intp, count=self.article_count)
+            for counts in (
+                map(bool, map(attrgetter("doi"), articles)),
+                map(len, map(attrgetter("urls"), articles)),
+                map(bool, map(attrgetter("title"), articles)),
+                map(len, map(attrgetter("title_alternatives"), articles)),
+                map(len, map(attrgetter("descriptions"), articles)),
+                map(len, map(attrgetter("publishers"), articles)),
+                map(len, map(attrgetter("domains"), articles)))],
+            dtype=np.intp)
+
+    def _get_coauthor_positions(
+            self, author_lists: List[Collection[Author]]) -> np.ndarray:
+        """
+        :returns: positions of the authors in the coauthor order of their
+        article, only the first ones may be ranked for articles with huge
+        author lists
+        """
+        key_codes, distinct_keys = _get_value_codes(list(map(
+            get_coauthor_order_key, chain.from_iterable(author_lists))))
+        key_ranks = np.empty(len(distinct_keys), dtype=np.intp)
+        key_ranks[sorted(range(len(distinct_keys)),
+                         key=distinct_keys.__getitem__)] = np.arange(
+            len(distinct_keys))
+
+        # stable, authors with the same key keep their iteration order as
+        # they do in the rank memo
+        author_order = np.lexsort((key_ranks[key_codes],
+                                   self.article_author_owners))
+        author_positions = np.empty_like(author_order)
+        author_positions[author_order] = np.arange(len(author_order))
+        article_starts = (np.cumsum(self.article_author_counts) -
+                          self.article_author_counts)
+
+        return (author_positions -
+                article_starts[self.article_author_owners])
+
+    def _score_affiliations(self, researcher: Researcher) -> Tuple[
+            np.ndarray, np.ndarray]:
+        """
+        :returns: ranks of the affiliations and whether they match the
+        researcher's affiliation perfectly
+        """
+        institution_scores = [
+            researcher.rank_memo.get_institution_rank(institution,
+                                                      researcher)
+            for institution in self.institutions]
+        institution_ranks = np.array(
+            [rank for rank, _ in institution_scores], dtype=np.float64)
+        institution_perfect_matches = np.array(
+            [has_perfect_match for _, has_perfect_match in
+             institution_scores], dtype=bool)
+        # institutions keep their perfect match once they had one
+        had_perfect_match = np.fromiter(
+            map(attrgetter("has_perfect_match"), self.affiliations),
+            dtype=bool, count=len(self.affiliations))
+
+        return (institution_ranks[self.affiliation_codes],
+                institution_perfect_matches[self.affiliation_codes] |
+                had_perfect_match)
+
+    def _rank_authors(self, researcher: Researcher) -> Tuple[
+            np.ndarray, np.ndarray]:
+        """
+        :returns: internal ranks and perfect match counts of the authors
+        """
+        affiliation_ranks, affiliation_perfect_matches = \
+            self._score_affiliations(researcher)
+
+        email_matches = np.array(
+            [email == researcher.email for email in self.emails],
+            dtype=bool)[self.email_codes]
+        email_ranks = np.where(
+            email_matches,
+            (Author._email_rank_value_match_multiplier *
+             Author._email_rank_value_match),
+            (Author._email_rank_value_presence_multiplier *
+             Author._email_rank_value_match))
+
+        orcid_matches = self.has_orcid & np.array(
+            [orcid == researcher.orcid for orcid in self.orcids],
+            dtype=bool)[self.orcid_codes]
+        orcid_ranks = np.where(
+            orcid_matches,
+            (Author._orcid_rank_value_match_multiplier *
+             Author._orcid_rank_value_match),
+            (Author._orcid_rank_value_presence_multiplier *
+             Author._orcid_rank_value_match))
+        orcid_ranks[~self.has_orcid] = 0
+
+        author_ranks = _sum_by_owner(self.affiliation_owners,
+                                     affiliation_ranks, self.author_count)
+        author_ranks += _sum_by_owner(self.email_owners, email_ranks,
+                                      self.author_count)
+        author_ranks += orcid_ranks
+        author_ranks += self.name_match_ratios
+
+        perfect_match_counts = (
+            np.bincount(self.affiliation_owners[affiliation_perfect_matches],
+                        minlength=self.author_count) +
+            np.bincount(self.email_owners[email_matches],
+                        minlength=self.author_count) +
+            orcid_matches +
+            (self.name_match_ratios == Author._MAX_NAME_MATCH_RATIO))
+
+        return author_ranks, perfect_match_counts
+
+    def _rank_articles(self, researcher: Researcher,
+                       author_ranks: np.ndarray) -> np.ndarray:
+        """
+        :returns: internal ranks of the articles
+        """
+        ranked_author_counts, coauthor_rank_scales = \
+            researcher.rank_memo.get_ranked_coauthor_counts(
+                self.article_author_counts)
+        is_ranked = (self.article_author_positions <
+                     ranked_author_counts[self.article_author_owners])
+        coauthor_owners = self.article_author_owners[is_ranked]
+        coauthor_rank_weights = (UnifiedSearchResult._coauthor_rank_weight *
+                                 coauthor_rank_scales)
+
+        # ranks of the matched authors are added up first, then the ones of
+        # the ranked coauthors
+        article_ranks = _sum_by_owner(
+            np.concatenate((self.matched_author_owners, coauthor_owners)),
+            np.concatenate((
+                author_ranks[self.matched_author_indices] *
+                UnifiedSearchResult._matched_author_rank_weight,
+                author_ranks[self.article_author_indices[is_ranked]] *
+                coauthor_rank_weights[coauthor_owners])),
+            self.article_count)
+
+        attribute_rank_values = (
+            UnifiedSearchResult._doi_rank_value,
+            UnifiedSearchResult._url_rank_value,
+            UnifiedSearchResult._title_rank_value,
+            UnifiedSearchResult._title_alt_rank_value,
+            UnifiedSearchResult._description_rank_value,
+            UnifiedSearchResult._publisher_rank_value,
+            UnifiedSearchResult._domain_rank_value)
+        for rank_value, counts in zip(attribute_rank_values,
+                                      self.attribute_counts):
+            # every attribute value is rewarded by its own addition
+            for count_index in range(int(counts.max(initial=0))):
+                article_ranks[counts > count_index] += rank_value
+
+        return article_ranks
+
+    def rank(self, researcher: Researcher) -> ColumnarRanking:
+        """
+        :param researcher: target researcher being verified
+        :returns: ranks of the results and their articles for the researcher
+        """
+        author_ranks, perfect_match_counts = self._rank_authors(researcher)
+        article_ranks = self._rank_articles(researcher, author_ranks)
+        result_article_ranks = _sum_by_owner(
+            self.article_owners, article_ranks,
+            len(self.result_author_indices))
+        result_author_ranks = author_ranks[self.result_author_indices]
+
+        return ColumnarRanking(
+            result_author_ranks,
+            perfect_match_counts[self.result_author_indices],
+            result_author_ranks + result_article_ranks, article_ranks,
+            self.article_offsets)
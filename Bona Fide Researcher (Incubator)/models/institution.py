@@ -6,6 +6,8 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
+from typing import Tuple
+
 from rapidfuzz import fuzz
 
 from abstracts.rankable import Rankable
@@ -13,22 +15,26 @@ from models.researcher import Researcher
 
 
 class Institution(Rankable):
+    __slots__ = ("name", "ror", "isni", "has_perfect_match")
+
+    # rank values shared by all the institutions
+    _name_rank_value_presence_multiplier = 0.1
+    _ror_rank_value_presence_multiplier = 0.1
+    _ror_rank_value_match_multiplier = 1
+    _isni_rank_value_presence_multiplier = 0.1
+    _isni_rank_value_match_multiplier = 1
+    rank_calculation_base_value = 100
+
     def __init__(self, name: str, ror: str = None, isni: str = None) -> None:
         super().__init__()
         self.name = name
-        self._name_rank_value_presence_multiplier = 0.1
 
         # Research Organization Registry ID
         self.ror = ror
-        self._ror_rank_value_presence_multiplier = 0.1
-        self._ror_rank_value_match_multiplier = 1
 
         # International Standard Name Identifier
         self.isni = isni
-        self._isni_rank_value_presence_multiplier = 0.1
-        self._isni_rank_value_match_multiplier = 1
 
-        self.rank_calculation_base_value = 100
         self.has_perfect_match = False
 
 
@@ -59,29 +65,45 @@ class Institution(Rankable):
             "isni": self.isni,
         }
 
-    # TODO - reevaluate rank calculation & rank values
     def calculate_internal_rank(self, researcher: Researcher) -> float:
-        self.internal_rank = 0
+        # equal institutions are scored once per researcher
+        internal_rank, has_perfect_match = \
+            researcher.rank_memo.get_institution_rank(self, researcher)
+
+        self.internal_rank = internal_rank
+        if has_perfect_match:
+            self.has_perfect_match = True
+
+        return self.internal_rank
+
+    # TODO - reevaluate rank calculation & rank values
+    def score_affiliation(self, researcher: Researcher) -> Tuple[float, bool]:
+        """
+        :returns: rank of the institution for the researcher's affiliation and
+        whether any of its attributes matches the affiliation perfectly
+        """
+        internal_rank = 0
+        has_perfect_match = False
         target_affiliation = researcher.affiliation
 
         if self.ror:
             if self.ror == target_affiliation:
-                self.has_perfect_match = True
-                self.internal_rank += (
+                has_perfect_match = True
+                internal_rank += (
                         self._ror_rank_value_match_multiplier *
                         self.rank_calculation_base_value)
             else:
-                self.internal_rank += (
+                internal_rank += (
                         self._ror_rank_value_presence_multiplier *
                         self.rank_calculation_base_value)
         if self.isni:
             if self.isni == target_affiliation:
-                self.has_perfect_match = True
-                self.internal_rank += (
+                has_perfect_match = True
+                internal_rank += (
                         self._isni_rank_value_match_multiplier *
                         self.rank_calculation_base_value)
             else:
-                self.internal_rank += (
+                internal_rank += (
                         self._isni_rank_value_presence_multiplier *
                         self.rank_calculation_base_value)
 
@@ -90,8 +112,8 @@ class Institution(Rankable):
                          self.rank_calculation_base_value)
             match_rank = fuzz.ratio(self.name, researcher.affiliation)
             if match_rank == 100:
-                self.has_perfect_match = True
+                has_perfect_match = True
 
-            self.internal_rank += max(base_rank, match_rank)
+            internal_rank += max(base_rank, match_rank)
 
-        return self.internal_rank
+        return internal_rank, has_perfect_match
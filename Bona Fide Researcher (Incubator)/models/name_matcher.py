@@ -7,15 +7,23 @@
       =
 """
 import re
+from typing import List, Sequence, Tuple
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+
+NAME_INITIAL_REGEX = re.compile(r"^[^.]\.?$")
+# fuzz.ratio is normalized to 0-100
+MAX_NAME_PART_RATIO = 100
+# avoids rejecting candidates right at the cutoff due to float rounding
+_SCORE_CUTOFF_TOLERANCE = 1e-9
 
 
 class NameMatcher:
     def __init__(self, uncertain_name_order: bool = False, match_threshold: float = 65):
         self.uncertain_name_order = uncertain_name_order
         self.match_threshold = match_threshold
-        self._NAME_INITIAL_REGEX = re.compile(r"^[^.]\.?$")
+        self._NAME_INITIAL_REGEX = NAME_INITIAL_REGEX
 
     def get_name_match_ratio(self, candidate_given_name: str, candidate_surname: str, target_given_name: str, target_surname: str) -> float:
         if not candidate_given_name or not candidate_surname or not target_given_name or not target_surname:
@@ -49,3 +57,324 @@ class NameMatcher:
 
         return combined_max_match_ratio
 
+    def get_name_match_ratios(self, candidate_names: Sequence[Tuple[str, str]],
+                              target_given_name: str,
+                              target_surname: str) -> List[float]:
+        """
+        Score all the candidate names against the target at once. The scores
+        are the same as the ones of get_name_match_ratio for every single
+        candidate.
+        :param candidate_names: (given name, surname) pairs of the candidates
+        :param target_given_name: given name of the target researcher
+        :param target_surname: surname of the target researcher
+        :returns: name match ratios in the order of the candidates
+        """
+        if not candidate_names:
+            return []
+
+        if not target_given_name or not target_surname:
+            return [0] * len(candidate_names)
+
+        candidate_given_names = [given_name or ""
+                                 for given_name, _ in candidate_names]
+        candidate_surnames = [surname or "" for _, surname in candidate_names]
+        target_names = [target_given_name, target_surname]
+
+        # columns - ratio with the target given name and the target surname
+        given_name_ratios = process.cdist(candidate_given_names, target_names,
+                                          scorer=fuzz.ratio, dtype=np.float64)
+        surname_ratios = process.cdist(candidate_surnames, target_names,
+                                       scorer=fuzz.ratio, dtype=np.float64)
+
+        is_name_initial = np.array(
+            [re.match(self._NAME_INITIAL_REGEX, given_name) is not None
+             for given_name in candidate_given_names], dtype=bool)
+        first_letters = [given_name[:1] for given_name in candidate_given_names]
+
+        # Handle initials only - give at least minimum match threshold
+        given_name_ratios_initials = np.where(
+            is_name_initial & np.array(
+                [letter == target_given_name[0] for letter in first_letters],
+                dtype=bool),
+            self.match_threshold, 0)
+        match_ratios = np.maximum(
+            given_name_ratios[:, 0] + surname_ratios[:, 1],
+            given_name_ratios_initials + surname_ratios[:, 1])
+
+        if self.uncertain_name_order:
+            match_ratios = np.maximum(
+                match_ratios, given_name_ratios[:, 1] + surname_ratios[:, 0])
+
+            given_name_ratios_initials = np.where(
+                is_name_initial & np.array(
+                    [letter == target_surname[0] for letter in first_letters],
+                    dtype=bool),
+                self.match_threshold, 0)
+            match_ratios = np.maximum(
+                match_ratios, given_name_ratios_initials + surname_ratios[:, 0])
+
+        has_both_names = np.array(
+            [bool(given_name) and bool(surname)
+             for given_name, surname in zip(candidate_given_names,
+                                            candidate_surnames)], dtype=bool)
+        match_ratios = np.where(has_both_names, match_ratios, 0)
+
+        return match_ratios.tolist()
+
+
+def get_max_name_ratio(length: int, other_length: int) -> float:
+    """
+    Upper bound of fuzz.ratio of two strings of the given (non-zero total)
+    lengths - the ratio is 100 * (1 - indel distance / total length) and the
+    indel distance is at least the difference of the lengths. Works with
+    NumPy arrays of lengths as well.
+    """
+    return (2 * MAX_NAME_PART_RATIO * np.minimum(length, other_length) /
+            (length + other_length))
+
+
+class TargetNameMatcher:
+    """
+    Name matcher bound to a single target researcher, meant to be reused for
+    all the candidates of a search. The target is preprocessed once and
+    candidates which cannot reach the score cutoff are rejected early (their
+    score is 0). Scores of the candidates reaching the cutoff are the same as
+    the ones of NameMatcher.
+
+    Before any fuzzy matching, candidates go through a blocking stage which
+    rejects the ones whose name lengths alone make the cutoff unreachable
+    (in any of the allowed name orders). The blocking is lossless, it never
+    rejects a candidate that would reach the cutoff.
+    """
+    def __init__(self, target_given_name: str, target_surname: str,
+                 uncertain_name_order: bool = False,
+                 match_threshold: float = 65, score_cutoff: float = 0):
+        self.target_given_name = target_given_name
+        self.target_surname = target_surname
+        self.uncertain_name_order = uncertain_name_order
+        self.match_threshold = match_threshold
+        self.score_cutoff = score_cutoff
+        # statistics of the blocking stage
+        self.candidate_count = 0
+        self.pruned_candidate_count = 0
+
+        self._has_target_names = bool(target_given_name and target_surname)
+        self._target_names = [target_given_name, target_surname]
+        self._target_initials = ((target_given_name or "")[:1],
+                                 (target_surname or "")[:1])
+        self._target_lengths = (len(target_given_name or ""),
+                                len(target_surname or ""))
+        # (given name column, surname column) of the target names
+        self._name_orders = [(0, 1)]
+        if uncertain_name_order:
+            self._name_orders.append((1, 0))
+        # the best possible score of a given name, be it a fuzzy match or an
+        # initial
+        max_given_name_ratio = max(MAX_NAME_PART_RATIO, match_threshold)
+        # name parts scoring below this cannot make the sum reach the cutoff
+        self._name_part_cutoff = max(
+            0, score_cutoff - max_given_name_ratio - _SCORE_CUTOFF_TOLERANCE)
+
+    def _get_combined_ratio(self, candidate_given_name: str,
+                            candidate_surname: str, target_given_name: str,
+                            target_surname: str, target_initial: str,
+                            is_name_initial: bool) -> float:
+        surname_match_ratio = fuzz.ratio(candidate_surname, target_surname,
+                                         score_cutoff=self._name_part_cutoff)
+        if surname_match_ratio < self._name_part_cutoff:
+            return 0
+
+        given_name_cutoff = max(0, self.score_cutoff - surname_match_ratio -
+                                _SCORE_CUTOFF_TOLERANCE)
+        given_name_match_ratio = fuzz.ratio(candidate_given_name,
+                                            target_given_name,
+                                            score_cutoff=given_name_cutoff)
+
+        # Handle initials only - give at least minimum match threshold
+        if is_name_initial and candidate_given_name[0] == target_initial:
+            given_name_match_ratio = max(given_name_match_ratio,
+                                         self.match_threshold)
+
+        return given_name_match_ratio + surname_match_ratio
+
+    def _can_reach_cutoff(self, candidate_given_name: str,
+                          candidate_surname: str,
+                          is_name_initial: bool) -> bool:
+        given_name_length = len(candidate_given_name)
+        surname_length = len(candidate_surname)
+
+        for given_name_column, surname_column in self._name_orders:
+            # same bound as get_max_name_ratio, without the NumPy overhead
+            target_length = self._target_lengths[given_name_column]
+            max_given_name_ratio = (
+                2 * MAX_NAME_PART_RATIO * min(given_name_length,
+                                              target_length) /
+                (given_name_length + target_length))
+            if (is_name_initial and candidate_given_name[0] ==
+                    self._target_initials[given_name_column]):
+                max_given_name_ratio = max(max_given_name_ratio,
+                                           self.match_threshold)
+
+            target_length = self._target_lengths[surname_column]
+            max_surname_ratio = (
+                2 * MAX_NAME_PART_RATIO * min(surname_length, target_length) /
+                (surname_length + target_length))
+
+            if (max_given_name_ratio + max_surname_ratio >=
+                    self.score_cutoff - _SCORE_CUTOFF_TOLERANCE):
+                return True
+
+        return False
+
+    def get_name_match_ratio(self, candidate_given_name: str,
+                             candidate_surname: str) -> float:
+        """
+        :returns: match ratio of the candidate name and the target name, 0 if
+        it is lower than the score cutoff
+        """
+        if (not candidate_given_name or not candidate_surname or
+                not self._has_target_names):
+            return 0
+
+        self.candidate_count += 1
+        is_name_initial = re.match(NAME_INITIAL_REGEX,
+                                   candidate_given_name) is not None
+        if not self._can_reach_cutoff(candidate_given_name, candidate_surname,
+                                      is_name_initial):
+            self.pruned_candidate_count += 1
+            return 0
+
+        combined_max_match_ratio = self._get_combined_ratio(
+            candidate_given_name, candidate_surname, self.target_given_name,
+            self.target_surname, self._target_initials[0], is_name_initial)
+
+        if self.uncertain_name_order:
+            combined_max_match_ratio = max(
+                combined_max_match_ratio,
+                self._get_combined_ratio(
+                    candidate_given_name, candidate_surname,
+                    self.target_surname, self.target_given_name,
+                    self._target_initials[1], is_name_initial))
+
+        if combined_max_match_ratio < self.score_cutoff:
+            return 0
+
+        return combined_max_match_ratio
+
+    def get_candidate_mask(self, candidate_given_names: Sequence[str],
+                           candidate_surnames: Sequence[str]) -> np.ndarray:
+        """
+        Blocking stage - cheap rejection of the candidates which cannot reach
+        the score cutoff, judging by the lengths of their names and initials.
+        :returns: mask of the candidates worth fuzzy matching
+        """
+        candidate_count = len(candidate_given_names)
+        given_name_lengths = np.fromiter(map(len, candidate_given_names),
+                                         dtype=np.int64, count=candidate_count)
+        surname_lengths = np.fromiter(map(len, candidate_surnames),
+                                      dtype=np.int64, count=candidate_count)
+        has_both_names = (given_name_lengths > 0) & (surname_lengths > 0)
+        if not has_both_names.any():
+            return has_both_names
+
+        # initials can only be 1 or 2 characters long
+        is_name_initial = np.array(
+            [length <= 2 and
+             re.match(NAME_INITIAL_REGEX, given_name) is not None
+             for given_name, length in zip(candidate_given_names,
+                                           given_name_lengths)], dtype=bool)
+        first_letters = np.array([given_name[:1]
+                                  for given_name in candidate_given_names])
+
+        max_match_ratios = np.zeros(candidate_count)
+        for given_name_column, surname_column in self._name_orders:
+            max_given_name_ratios = get_max_name_ratio(
+                given_name_lengths, self._target_lengths[given_name_column])
+            has_matching_initial = is_name_initial & (
+                first_letters == self._target_initials[given_name_column])
+            max_given_name_ratios = np.where(
+                has_matching_initial,
+                np.maximum(max_given_name_ratios, self.match_threshold),
+                max_given_name_ratios)
+            max_surname_ratios = get_max_name_ratio(
+                surname_lengths, self._target_lengths[surname_column])
+            max_match_ratios = np.maximum(
+                max_match_ratios, max_given_name_ratios + max_surname_ratios)
+
+        return has_both_names & (max_match_ratios >= self.score_cutoff -
+                                 _SCORE_CUTOFF_TOLERANCE)
+
+    def get_name_match_ratios(self, candidate_names: Sequence[Tuple[str, str]]
+                              ) -> List[float]:
+        """
+        Score all the candidate names against the target at once.
+        :param candidate_names: (given name, surname) pairs of the candidates
+        :returns: name match ratios in the order of the candidates, 0 for the
+        ones lower than the score cutoff
+        """
+        if not candidate_names:
+            return []
+
+        if not self._has_target_names:
+            return [0] * len(candidate_names)
+
+        candidate_given_names = [given_name or ""
+                                 for given_name, _ in candidate_names]
+        candidate_surnames = [surname or "" for _, surname in candidate_names]
+
+        candidate_mask = self.get_candidate_mask(candidate_given_names,
+                                                 candidate_surnames)
+        candidate_indices = np.flatnonzero(candidate_mask)
+        # candidates without both names are not counted, same as in
+        # get_name_match_ratio
+        named_candidate_count = sum(
+            1 for given_name, surname in zip(candidate_given_names,
+                                             candidate_surnames)
+            if given_name and surname)
+        self.candidate_count += named_candidate_count
+        self.pruned_candidate_count += (named_candidate_count -
+                                        len(candidate_indices))
+
+        match_ratios = np.zeros(len(candidate_names))
+        if not len(candidate_indices):
+            return match_ratios.tolist()
+
+        candidate_given_names = [candidate_given_names[index]
+                                 for index in candidate_indices]
+        candidate_surnames = [candidate_surnames[index]
+                              for index in candidate_indices]
+
+        # name parts below the cutoff are reported as 0 by cdist, the sums
+        # containing them would not reach the cutoff anyway
+        given_name_ratios = process.cdist(
+            candidate_given_names, self._target_names, scorer=fuzz.ratio,
+            dtype=np.float64, score_cutoff=self._name_part_cutoff)
+        surname_ratios = process.cdist(
+            candidate_surnames, self._target_names, scorer=fuzz.ratio,
+            dtype=np.float64, score_cutoff=self._name_part_cutoff)
+
+        is_name_initial = np.array(
+            [re.match(NAME_INITIAL_REGEX, given_name) is not None
+             for given_name in candidate_given_names], dtype=bool)
+        first_letters = np.array([given_name[:1]
+                                  for given_name in candidate_given_names])
+
+        candidate_match_ratios = np.zeros(len(candidate_indices))
+        for given_name_column, surname_column in self._name_orders:
+            # Handle initials only - give at least minimum match threshold
+            has_matching_initial = is_name_initial & (
+                first_letters == self._target_initials[given_name_column])
+            given_name_match_ratios = np.where(
+                has_matching_initial,
+                np.maximum(given_name_ratios[:, given_name_column],
+                           self.match_threshold),
+                given_name_ratios[:, given_name_column])
+            candidate_match_ratios = np.maximum(
+                candidate_match_ratios,
+                given_name_match_ratios + surname_ratios[:, surname_column])
+
+        match_ratios[candidate_indices] = np.where(
+            candidate_match_ratios >= self.score_cutoff,
+            candidate_match_ratios, 0)
+
+        return match_ratios.tolist()
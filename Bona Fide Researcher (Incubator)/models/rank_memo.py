@@ -0,0 +1,141 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import heapq
+from typing import TYPE_CHECKING, Collection, Dict, Iterable, Tuple
+
+import numpy as np
+
+from utils.name_normalization import get_name_normalizer
+
+if TYPE_CHECKING:
+    from models.author import Author
+    from models.institution import Institution
+    from models.researcher import Researcher
+
+# 0 - ranks of all the authors of an article are counted
+DEFAULT_COAUTHOR_RANK_LIMIT = 0
+
+_coauthor_rank_limit = DEFAULT_COAUTHOR_RANK_LIMIT
+_coauthor_rank_sampling = False
+
+
+def configure_coauthor_ranking(
+        coauthor_rank_limit: int = DEFAULT_COAUTHOR_RANK_LIMIT,
+        coauthor_rank_sampling: bool = False) -> None:
+    """
+    Set how the coauthors of the articles with huge author lists are ranked
+    by the rank memos created afterwards. Meant to be called once at startup.
+    :param coauthor_rank_limit: maximum number of the ranked coauthors of an
+    article, not limited if not positive
+    :param coauthor_rank_sampling: the ranked coauthors are a sample, their
+    total rank is scaled up to all the coauthors (otherwise the rest of the
+    coauthors is just not counted)
+    """
+    global _coauthor_rank_limit, _coauthor_rank_sampling
+    _coauthor_rank_limit = coauthor_rank_limit
+    _coauthor_rank_sampling = coauthor_rank_sampling
+
+
+def get_coauthor_order_key(author: "Author") -> Tuple[str, str, str]:
+    """
+    :returns: key of the order in which the coauthors of an article are
+    picked to be ranked, the authors of an article are a set and their
+    iteration order depends on the string hashes of the process
+    """
+    return author.surname or "", author.given_name or "", author.orcid or ""
+
+
+def get_institution_key(institution: "Institution") -> Tuple:
+    """
+    :returns: key of the institution in the rank memo, the spelling and
+    casing variants of the name of an institution share the key (and thus
+    the rank of the variant scored first)
+    """
+    return (get_name_normalizer().normalize(institution.name),
+            institution.ror, institution.isni)
+
+
+class RankMemo:
+    """
+    Memo of the ranks of entities repeating across the results of a single
+    verification job. The same few institutions are affiliations of most of
+    the matched authors and coauthors, each distinct institution is thus
+    scored once per researcher. Also decides which coauthors of an article
+    are ranked. Not thread-safe, the results of a job are ranked by a single
+    thread.
+    """
+    def __init__(self, coauthor_rank_limit: int = None,
+                 coauthor_rank_sampling: bool = None):
+        # (normalized name, ROR, ISNI) -> (rank, has perfect match)
+        self._institution_ranks: Dict[Tuple, Tuple[float, bool]] = {}
+
+        if coauthor_rank_limit is None:
+            coauthor_rank_limit = _coauthor_rank_limit
+        self.coauthor_rank_limit = coauthor_rank_limit
+
+        if coauthor_rank_sampling is None:
+            coauthor_rank_sampling = _coauthor_rank_sampling
+        self.coauthor_rank_sampling = coauthor_rank_sampling
+
+    def get_institution_rank(self, institution: "Institution",
+                             researcher: "Researcher") -> Tuple[float, bool]:
+        """
+        :returns: rank of the institution and whether any of its attributes
+        matches the researcher's affiliation perfectly
+        """
+        key = get_institution_key(institution)
+        institution_rank = self._institution_ranks.get(key)
+        if institution_rank is None:
+            institution_rank = institution.score_affiliation(researcher)
+            self._institution_ranks[key] = institution_rank
+
+        return institution_rank
+
+    def get_ranked_coauthors(self, authors: Collection["Author"]) -> (
+            Tuple[Iterable["Author"], float]):
+        """
+        :returns: authors of an article whose ranks are counted (the first
+        ones in the coauthor order up to the limit) and the scale of their
+        ranks
+        """
+        author_count = len(authors)
+        if not 0 < self.coauthor_rank_limit < author_count:
+            return authors, 1
+
+        ranked_author_ids = set(map(id, heapq.nsmallest(
+            self.coauthor_rank_limit, authors, key=get_coauthor_order_key)))
+        # the ranks are still added up in the iteration order of the authors
+        coauthors = [author for author in authors
+                     if id(author) in ranked_author_ids]
+        if self.coauthor_rank_sampling:
+            return coauthors, author_count / self.coauthor_rank_limit
+
+        return coauthors, 1
+
+    def get_ranked_coauthor_counts(self, author_counts: np.ndarray) -> (
+            Tuple[np.ndarray, np.ndarray]):
+        """
+        Columnar counterpart of get_ranked_coauthors.
+        :param author_counts: numbers of the authors of the articles
+        :returns: numbers of the authors of the articles whose ranks are
+        counted (the first ones in the coauthor order) and the scales of their
+        ranks
+        """
+        scales = np.ones(len(author_counts))
+        if self.coauthor_rank_limit <= 0:
+            return author_counts, scales
+
+        is_limited = author_counts > self.coauthor_rank_limit
+        ranked_counts = np.where(is_limited, self.coauthor_rank_limit,
+                                 author_counts)
+        if self.coauthor_rank_sampling:
+            scales[is_limited] = (author_counts[is_limited] /
+                                  self.coauthor_rank_limit)
+
+        return ranked_counts, scales
@@ -6,6 +6,9 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
+from models.rank_memo import RankMemo
+
+
 class Researcher:
     def __init__(self, given_name: str = None, surname: str = None, email: str = None, orcid: str = None, affiliation: str = None, has_uncertain_name_order: bool = False):
         self.given_name = given_name
@@ -14,3 +17,5 @@ class Researcher:
         self.orcid = orcid
         self.affiliation = affiliation
         self.has_uncertain_name_order = has_uncertain_name_order
+        # ranks of the repeating entities scored against this researcher
+        self.rank_memo = RankMemo()
@@ -14,6 +14,9 @@ from models.search_results.search_result import SearchResult
 
 
 class ArxivSearchResult(SearchResult):
+    __slots__ = ("matched_author", "authors", "doi", "url", "arxiv_id",
+                 "title", "summary", "domains", "raw_data")
+
     def __init__(self, matched_author: Author, authors: List[Author], doi: str,
                  url: str, arxiv_id: str, title: str, summary: str, domains: List[str],
                  raw_data: Any):
@@ -14,6 +14,9 @@ from models.search_results.search_result import SearchResult
 
 
 class CrossrefSearchResult(SearchResult):
+    __slots__ = ("matched_author", "authors", "doi", "url", "title",
+                 "publisher", "raw_data")
+
     def __init__(self, matched_author: Author, authors: List[Author], doi: str,
                  url: str, title: str, publisher: str,
                  raw_data: Any):
@@ -14,6 +14,9 @@ from models.search_results.search_result import SearchResult
 
 
 class EoscSearchResult(SearchResult):
+    __slots__ = ("matched_author", "authors", "doi", "urls", "publishers",
+                 "title", "domains", "raw_data")
+
     def __init__(self, matched_author: Author, authors: List[Author], doi: str,
                  urls: Set[str], publishers: Set[str], title: str, domains: List[str],
                  raw_data: Any):
@@ -14,6 +14,8 @@ from models.search_results.search_result import SearchResult
 
 
 class OrcidSearchResult(SearchResult):
+    __slots__ = ("matched_author", "raw_data")
+
     def __init__(self, matched_author: Author, raw_data: Any):
         super().__init__()
         self.matched_author = matched_author
@@ -13,6 +13,8 @@ from models.researcher import Researcher
 
 
 class SearchResult(Rankable):
+    __slots__ = ()
+
     def __init__(self, internal_rank: float = 0) -> None:
         super().__init__(internal_rank)
 
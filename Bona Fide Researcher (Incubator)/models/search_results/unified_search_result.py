@@ -6,16 +6,37 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
-from typing import Any, Set
+from typing import Any, List, Set, Tuple
 
 from interfaces.imergeable import IMergeable
+from models.article_index import normalize_doi
 from models.author import Author
 from models.researcher import Researcher
 from models.search_results.search_result import SearchResult
 from utils.formatting import print_delimiter_medium
 
+RAW_DATA_SEPARATOR = "\n--------------------\n"
+# shared by all the attributes without values, it must not be mutated
+_EMPTY_SET = frozenset()
+
 
 class UnifiedSearchResult(SearchResult, IMergeable["UnifiedSearchResult"]):
+    __slots__ = ("matched_author", "authors", "doi", "urls", "title",
+                 "descriptions", "title_alternatives", "publishers", "domains",
+                 "data_source", "raw_data_sources")
+
+    # rank values shared by all the results
+    _matched_author_rank_weight = 1
+    _coauthor_rank_weight = 0.2
+    _doi_rank_value = 1
+    _url_rank_value = 1
+    _title_rank_value = 1
+    _description_rank_value = 1
+    _title_alt_rank_value = 1
+    _publisher_rank_value = 1
+    _domain_rank_value = 1
+    _raw_data_rank_value = 0
+
     def __init__(self, matched_author: Author = None,
                  authors: Set[Author] = None, doi: str = None,
                  urls: Set[str] = None, title: str = None, descriptions: Set[str] = None,
@@ -24,46 +45,58 @@ class UnifiedSearchResult(SearchResult, IMergeable["UnifiedSearchResult"]):
                  data_source: str = "?"):
         super().__init__()
         self.matched_author = matched_author
-        self._matched_author_rank_weight = 1
 
         if not authors:
             authors = set()
         self.authors = authors
-        self._coauthor_rank_weight = 0.2
 
         self.doi = doi
-        self._doi_rank_value = 1
 
         if not urls:
             urls = set()
         self.urls = urls
-        self._url_rank_value = 1
 
         self.title = title
-        self._title_rank_value = 1
 
         if not descriptions:
             descriptions = set()
         self.descriptions = descriptions
-        self._description_rank_value = 1
 
-        self.title_alternatives = set()
-        self._title_alt_rank_value = 1
+        # alternatives are rare, the (shared) empty frozenset is replaced by a
+        # set once there is one
+        self.title_alternatives = _EMPTY_SET
 
         if not publishers:
             publishers = set()
         self.publishers = publishers
-        self._publisher_rank_value = 1
 
         if not domains:
             domains = set()
         self.domains = domains
-        self._domain_rank_value = 1
 
         self.data_source = data_source
 
-        self.raw_data = raw_data
-        self._raw_data_rank_value = 0
+        # [(data source, raw data), ...] - references to the raw payloads of
+        # all the merged results, serialized only when printed
+        self.raw_data_sources: List[Tuple[str, Any]] = []
+        if raw_data is not None:
+            self.raw_data_sources.append((data_source, raw_data))
+
+    @property
+    def raw_data(self) -> str:
+        """
+        :returns: raw data of all the merged results, labeled by their source
+        """
+        return RAW_DATA_SEPARATOR.join(
+            f"SOURCE: ({data_source}) -> {raw_data}"
+            for data_source, raw_data in self.raw_data_sources)
+
+    def release_raw_data(self) -> None:
+        """
+        Drop the references to the raw payloads, they are needed only for
+        the verbose output.
+        """
+        self.raw_data_sources = []
 
     # TODO - implement fully
     def merge_with(self, other: "UnifiedSearchResult",
@@ -75,7 +108,8 @@ class UnifiedSearchResult(SearchResult, IMergeable["UnifiedSearchResult"]):
         #     for external_author in other.authors:
         #         current_author.merge_with(external_author)
 
-        if not self.doi and other.doi:
+        # some data sources fill in a placeholder for the missing DOI
+        if not normalize_doi(self.doi) and normalize_doi(other.doi):
             self.doi = other.doi
 
         self.urls.update(other.urls)
@@ -83,16 +117,14 @@ class UnifiedSearchResult(SearchResult, IMergeable["UnifiedSearchResult"]):
         if not self.title and other.title:
             self.title = other.title
         elif self.title and other.title and self.title != other.title:
-            self.title_alternatives.add(other.title)
+            self.title_alternatives = {*self.title_alternatives, other.title}
 
         self.publishers.update(other.publishers)
         self.domains.update(other.domains)
 
-        separator = "\n--------------------\n"
+        self.raw_data_sources.extend(other.raw_data_sources)
 
-        self.raw_data = str(self.raw_data)
-        self.raw_data += (f"{separator}SOURCE: ({self.data_source}) -> "
-                          f"{self.raw_data}")
+        self.invalidate_rank()
 
     # TODO - reevaluate rank calculation & rank values
     # Quality of DAta source could be incorporated into ranking
@@ -100,13 +132,20 @@ class UnifiedSearchResult(SearchResult, IMergeable["UnifiedSearchResult"]):
     def calculate_internal_rank(self, researcher: Researcher) -> float:
         self.internal_rank = 0
 
+        # rank breakdowns of the article authors are never presented
         if self.matched_author:
             self.internal_rank += (self._matched_author_rank_weight *
-                                   self.matched_author.calculate_internal_rank(
+                                   self.matched_author.get_coauthor_rank(
                 researcher))
 
-        for author in self.authors:
-            self.internal_rank += author.calculate_internal_rank(researcher) * self._coauthor_rank_weight
+        # authors keep their ranks until they are merged with another author,
+        # only a part of them may be ranked for articles with huge author
+        # lists
+        coauthors, coauthor_rank_scale = \
+            researcher.rank_memo.get_ranked_coauthors(self.authors)
+        coauthor_rank_weight = self._coauthor_rank_weight * coauthor_rank_scale
+        for author in coauthors:
+            self.internal_rank += author.get_coauthor_rank(researcher) * coauthor_rank_weight
 
         if self.doi:
             self.internal_rank += self._doi_rank_value
@@ -6,20 +6,99 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
+import heapq
 import math
-from itertools import islice
-from typing import List
+from typing import Callable, Iterable, List, Tuple
 
+from models.article_index import ArticleIndex
+from models.author_index import AuthorIndex
+from models.columnar_ranking import ColumnarRankingEngine
 from models.researcher import Researcher
 from models.search_results.unified_search_result import UnifiedSearchResult
 from utils.formatting import print_delimiter_large
 
 
 class SearchResultsAggregator:
-    def __init__(self, researcher: Researcher, verbose: bool = False):
+    """
+    Aggregates the search results per author. Authors are resolved across
+    the data sources by the author index, the aggregated results are keyed by
+    the author IDs, articles of an author are keyed by the article IDs of the
+    article index. Ranks are maintained incrementally - they are calculated
+    when results are added and only the authors and articles touched by a
+    merge are ranked again. Only the presented top results are ordered, the
+    rest is never sorted. With the columnar ranking, the results are not
+    ranked as they are added, all of them are ranked at once by the columnar
+    ranking engine when they are presented (meant for huge result sets).
+    """
+    def __init__(self, researcher: Researcher, verbose: bool = False,
+                 keep_raw_data: bool = True, columnar_ranking: bool = False):
+        """
+        :param keep_raw_data: keep raw data of the results, without it the
+        verbose output contains no raw data
+        :param columnar_ranking: rank the results with the columnar ranking
+        engine, the order of the results is the same
+        """
         self.researcher = researcher
+        # author ID -> {"author": ..., "articles": ..., "internal_rank": ...}
         self.aggregated_search_results = {}
         self.verbose = verbose
+        self.keep_raw_data = keep_raw_data
+        self.columnar_ranking = columnar_ranking
+        self.author_index = AuthorIndex()
+        self.article_index = ArticleIndex()
+        # id(author) -> articles containing the author (matched or coauthor)
+        self._articles_by_author = {}
+        # id(article) -> author ID of the aggregated result holding the
+        # article (possibly united into another ID since)
+        self._author_ids_by_article = {}
+        # author IDs of the results whose ranks need to be recalculated
+        self._results_to_rank = set()
+
+    def _index_article(self, article: UnifiedSearchResult,
+                       author_id: int) -> None:
+        self._author_ids_by_article[id(article)] = author_id
+        for author in {id(author): author for author in
+                       [article.matched_author, *article.authors]}.values():
+            self._articles_by_author.setdefault(id(author), []).append(
+                article)
+
+    def _invalidate_result(self, author_id: int) -> None:
+        self._results_to_rank.add(author_id)
+
+    def _invalidate_author(self, author) -> None:
+        # the author changed, so did the ranks of all the articles it is
+        # part of (the author of a result is the matched author of one of
+        # its articles)
+        for article in self._articles_by_author.get(id(author), []):
+            article.invalidate_rank()
+            self._invalidate_result(self.author_index.find(
+                self._author_ids_by_article[id(article)]))
+
+    def _add_article(self, article: UnifiedSearchResult, author_id: int,
+                     article_id: int, is_indexed: bool = False) -> None:
+        articles = self.aggregated_search_results[author_id]["articles"]
+        stored_article: UnifiedSearchResult = articles.get(article_id)
+        # store article from the search result if not already present
+        if not stored_article:
+            articles[article_id] = article
+            if not is_indexed:
+                self._index_article(article, author_id)
+        # if the same article (by DOI or title) already exists, consolidate
+        # information with the new data source
+        else:
+            stored_article.merge_with(article)
+            self._invalidate_author(stored_article.matched_author)
+
+        self._invalidate_result(author_id)
+
+    def _unite_results(self, author_id: int, united_author_id: int) -> None:
+        # the author turned out to be the same person as another one (e.g.
+        # through the ORCID of one and the email of the other)
+        united_results = self.aggregated_search_results.pop(united_author_id)
+        self._results_to_rank.discard(united_author_id)
+        for article_id, article in united_results["articles"].items():
+            self._add_article(article, author_id, article_id,
+                              is_indexed=True)
 
     def add_results(self, search_results: List[UnifiedSearchResult]):
         total = len(search_results)
@@ -32,63 +111,123 @@ class SearchResultsAggregator:
                 print(
                     f"Author not found for result: {search_result}. Skipping.")
                 continue
-            aggregated_search_result = self.aggregated_search_results.get(author)
 
-            if not aggregated_search_result:
-                    self.aggregated_search_results[author] = {"articles": {},
-                                                              "internal_rank": 0}
+            if not self.keep_raw_data:
+                search_result.release_raw_data()
 
-            # TODO - handle missing DOI
-            doi = search_result.doi
-            # TODO - check correctness of .get("articles")
-            stored_article: UnifiedSearchResult = self.aggregated_search_results[author].get("articles", {}).get(doi)
-            # store article from the search result if not already present
-            if not stored_article:
-                stored_article = search_result
-                self.aggregated_search_results[author]["articles"][doi] = search_result
-            # if article with the same DOI already exists, consolidate information with the new data source
-            else:
-                stored_article.merge_with(search_result)
+            author_id, united_author_ids = self.author_index.add(author)
+            for united_author_id in united_author_ids:
+                self._unite_results(author_id, united_author_id)
 
+            if author_id not in self.aggregated_search_results:
+                # the first author of the person represents it
+                self.aggregated_search_results[author_id] = {
+                    "author": author, "articles": {}, "internal_rank": 0}
 
-            self.aggregated_search_results[author]["articles"][doi] = stored_article
+            article_id = self.article_index.add(search_result)
+            self._add_article(search_result, author_id, article_id)
 
             count += 1
             if count % print_update_interval == 0:
                 print(f"Processed {count}/{total} search results")
 
-    # TODO - prevent double scoring of inner structures
+        if not self.columnar_ranking:
+            self._rank_results()
+
     def _rank_results(self):
-        for author, results in self.aggregated_search_results.items():
+        # only the results touched since the last ranking are ranked again,
+        # ranks of untouched authors and articles are cached
+        for author_id in self._results_to_rank:
+            results = self.aggregated_search_results[author_id]
+            author = results["author"]
             article_scores = 0
             for search_result in results["articles"].values():
-                article_scores += search_result.calculate_internal_rank(self.researcher)
+                article_scores += search_result.get_internal_rank(self.researcher)
+
+            author_score = author.get_internal_rank(self.researcher)
+            results["internal_rank"] = author_score + article_scores
+
+        self._results_to_rank = set()
 
-            author_score = author.calculate_internal_rank(self.researcher)
-            self.aggregated_search_results[author]["internal_rank"] = author_score + article_scores
+    @staticmethod
+    def _get_author_sort_key(author) -> tuple:
+        return author.perfect_match_attrs_count, author.internal_rank
 
-    def _sort_results(self):
+    @staticmethod
+    def _get_article_sort_key(article: UnifiedSearchResult) -> float:
+        return article.internal_rank
+
+    @staticmethod
+    def _select_top(items: Iterable, key: Callable, limit: int,
+                    item_count: int) -> List:
+        """
+        :returns: the items in descending order of the key, only the first
+        `limit` of them if the limit is positive. A heap selection is used
+        for the limited case - nlargest is stable just like sorted, so ties
+        keep their insertion order in both cases.
+        """
+        if 0 < limit < item_count:
+            return heapq.nlargest(limit, items, key=key)
+
+        return sorted(items, key=key, reverse=True)
+
+    def _sort_results(self, limit_results: int,
+                      limit_articles: int) -> List[Tuple]:
         # Sort results overall (authors displayed in order of relevance)
-        # Sorting based on author's rank
-        self.aggregated_search_results = dict(sorted(
-            self.aggregated_search_results.items(),
-            key=lambda result: (result[0].perfect_match_attrs_count,
-                                result[0].internal_rank),
-            reverse=True))
+        # Sorting based on author's rank, only the top authors are selected
+        top_results = self._select_top(
+            self.aggregated_search_results.values(),
+            lambda results: self._get_author_sort_key(results["author"]),
+            limit_results, len(self.aggregated_search_results))
 
         # Sort articles within author's records in order of relevance
-        for author, result in self.aggregated_search_results.items():
-            articles = result["articles"]
-            self.aggregated_search_results[author]["articles"] = dict(sorted(
-            articles.items(),
-            key=lambda result: result[1].internal_rank,
-            reverse=True))
-
-    def _print_search_results(self, limit_results: int):
-        for index, (author, results) in enumerate(self.aggregated_search_results.items()):
-            if index == limit_results:
-                break
+        sorted_results = []
+        for results in top_results:
+            articles = results["articles"]
+            sorted_articles = self._select_top(
+                articles.values(), self._get_article_sort_key,
+                limit_articles, len(articles))
+            sorted_results.append((results["author"], results,
+                                   sorted_articles))
+
+        return sorted_results
+
+    def _sort_results_columnar(self, limit_results: int,
+                               limit_articles: int) -> List[Tuple]:
+        # all the results are ranked from scratch, nothing is left to be
+        # ranked incrementally
+        self._results_to_rank = set()
+        all_results = list(self.aggregated_search_results.values())
+        articles_by_result = [list(results["articles"].values())
+                              for results in all_results]
+        ranking = ColumnarRankingEngine(
+            [(results["author"], articles) for results, articles in
+             zip(all_results, articles_by_result)]).rank(self.researcher)
+        for results, result_rank in zip(all_results,
+                                        ranking.result_ranks.tolist()):
+            results["internal_rank"] = result_rank
 
+        sorted_results = []
+        for result_index in ranking.get_result_order(limit_results).tolist():
+            results = all_results[result_index]
+            author = results["author"]
+            articles = articles_by_result[result_index]
+            sorted_articles = [
+                articles[article_index] for article_index in
+                ranking.get_article_order(result_index,
+                                          limit_articles).tolist()]
+            # only the presented authors and articles are ranked by the
+            # models, their authors thus carry the rank breakdowns and the
+            # perfect match counts
+            author.get_internal_rank(self.researcher)
+            for article in sorted_articles:
+                article.get_internal_rank(self.researcher)
+            sorted_results.append((author, results, sorted_articles))
+
+        return sorted_results
+
+    def _print_search_results(self, sorted_results: List[Tuple]):
+        for index, (author, results, articles) in enumerate(sorted_results):
             print_delimiter_large()
             author_rank = round(author.internal_rank, 2)
             articles_rank = round(results["internal_rank"], 2)
@@ -106,28 +245,40 @@ class SearchResultsAggregator:
 
             print(author)
             print("Collected works:")
-            for doi, search_result in results["articles"].items():
+            for search_result in articles:
                 search_result.print(verbose=self.verbose)
 
-    def _prepare_search_results(self):
-        self._rank_results()
-        self._sort_results()
+    def _prepare_search_results(self, limit_results: int,
+                                limit_articles: int) -> List[Tuple]:
+        if self.columnar_ranking:
+            return self._sort_results_columnar(limit_results, limit_articles)
 
-    def present_search_results_cli(self, limit_results: int):
-        self._prepare_search_results()
-        self._print_search_results(limit_results)
+        self._rank_results()
+        return self._sort_results(limit_results, limit_articles)
 
-    def get_search_results_dict(self, limit_results: int):
-        self._prepare_search_results()
-        top_results = self.aggregated_search_results
-        if 0 < limit_results < len(self.aggregated_search_results):
-            top_results = dict(islice(
-                self.aggregated_search_results.items(), limit_results))
+    def present_search_results_cli(self, limit_results: int,
+                                   limit_articles: int = -1):
+        """
+        :param limit_results: number of the top authors to print, all of them
+        if not positive
+        :param limit_articles: number of the top articles to print per author,
+        all of them if not positive
+        """
+        self._print_search_results(
+            self._prepare_search_results(limit_results, limit_articles))
 
+    def get_search_results_dict(self, limit_results: int,
+                                limit_articles: int = -1):
+        """
+        :param limit_results: number of the top authors to return, all of
+        them if not positive
+        :param limit_articles: number of the top articles to return per
+        author, all of them if not positive
+        """
         results_to_present = {"candidates": []}
-        for author, info in top_results.items():
-            articles_info = [article.to_dict() for article in info[
-                "articles"].values()]
+        for author, info, articles in self._prepare_search_results(
+                limit_results, limit_articles):
+            articles_info = [article.to_dict() for article in articles]
             candidate = {"author": author.to_dict(),
                          "score_breakdown": {
                              "author": author.rank_breakdown
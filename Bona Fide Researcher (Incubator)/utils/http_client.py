@@ -0,0 +1,113 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 60
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+class PooledHttpClient:
+    """
+    Thin wrapper around requests that keeps one session (and therefore one
+    pool of warm keep-alive connections) per upstream host. Sessions are
+    created lazily and shared by all the threads using the client.
+    """
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT):
+        # maximum number of connections kept open to a single host
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                              pool_block=False)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        url_parts = urlsplit(url)
+        host = f"{url_parts.scheme}://{url_parts.netloc}"
+
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[host] = session
+
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def get(self, url: str, params: dict = None, headers: dict = None,
+            **kwargs) -> requests.Response:
+        return self.request("GET", url, params=params, headers=headers,
+                            **kwargs)
+
+    def post(self, url: str, json: dict = None, **kwargs) -> requests.Response:
+        return self.request("POST", url, json=json, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+_shared_http_client = None
+_shared_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHttpClient:
+    """
+    :returns: process-wide HTTP client shared by all the verification modules
+    """
+    global _shared_http_client
+    if _shared_http_client is None:
+        with _shared_http_client_lock:
+            if _shared_http_client is None:
+                _shared_http_client = PooledHttpClient()
+
+    return _shared_http_client
+
+
+def configure_http_client(pool_size: int = DEFAULT_POOL_SIZE,
+                          connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                          read_timeout: float = DEFAULT_READ_TIMEOUT) -> (
+        PooledHttpClient):
+    """
+    Replace the shared HTTP client with one using the given settings. Meant to
+    be called once at startup, before any module issues a request.
+    """
+    global _shared_http_client
+    with _shared_http_client_lock:
+        if _shared_http_client is not None:
+            _shared_http_client.close()
+        _shared_http_client = PooledHttpClient(pool_size, connect_timeout,
+                                               read_timeout)
+
+    return _shared_http_client
@@ -0,0 +1,121 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import threading
+from functools import lru_cache
+
+from unidecode import unidecode
+
+DEFAULT_NAME_NORMALIZATION_CACHE_SIZE = 100_000
+# punctuation left around name parts by "Surname, Given name; ..." lists
+NAME_PART_PUNCTUATION = ",;"
+
+
+def _clean_name_part(name_part: str) -> str:
+    return name_part.strip(NAME_PART_PUNCTUATION)
+
+
+def _casefold_name(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def _normalize_name(name: str) -> str:
+    name_parts = [_clean_name_part(name_part)
+                  for name_part in unidecode(name).split()]
+    return " ".join(name_part for name_part in name_parts if name_part
+                    ).casefold()
+
+
+class NameNormalizer:
+    """
+    Memoized normalization of name strings. The same names keep coming from
+    all the data sources and jobs, each distinct string is thus normalized
+    once per process. Every kind of normalization has its own bounded LRU
+    cache (functools.lru_cache is thread-safe).
+    """
+    def __init__(self, max_size: int = DEFAULT_NAME_NORMALIZATION_CACHE_SIZE):
+        self.max_size = max_size
+        self._caches = {
+            "transliterate": lru_cache(maxsize=max_size)(unidecode),
+            "casefold": lru_cache(maxsize=max_size)(_casefold_name),
+            "normalize": lru_cache(maxsize=max_size)(_normalize_name),
+        }
+
+    def transliterate(self, name: str) -> str:
+        """
+        :returns: the name with special characters replaced by their ASCII
+        counterparts (Jiří -> Jiri)
+        """
+        return self._caches["transliterate"](name or "")
+
+    def casefold(self, name: str) -> str:
+        """
+        :returns: the name with collapsed whitespace, case-insensitive
+        """
+        return self._caches["casefold"](name or "")
+
+    def normalize(self, name: str) -> str:
+        """
+        :returns: the name stripped, transliterated, casefolded and without
+        the list punctuation around its parts
+        """
+        return self._caches["normalize"](name or "")
+
+    def get_stats(self) -> dict:
+        """
+        :returns: hit/miss counters and sizes of the normalization caches
+        """
+        stats = {}
+        for normalization, cache in self._caches.items():
+            cache_info = cache.cache_info()
+            lookups = cache_info.hits + cache_info.misses
+            stats[normalization] = {
+                "hits": cache_info.hits,
+                "misses": cache_info.misses,
+                "hit_rate": (round(cache_info.hits / lookups, 4)
+                             if lookups else 0),
+                "entries": cache_info.currsize,
+                "max_entries": cache_info.maxsize,
+            }
+
+        return stats
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.cache_clear()
+
+
+_shared_name_normalizer = None
+_shared_name_normalizer_lock = threading.Lock()
+
+
+def get_name_normalizer() -> NameNormalizer:
+    """
+    :returns: process-wide name normalizer
+    """
+    global _shared_name_normalizer
+    if _shared_name_normalizer is None:
+        with _shared_name_normalizer_lock:
+            if _shared_name_normalizer is None:
+                _shared_name_normalizer = NameNormalizer()
+
+    return _shared_name_normalizer
+
+
+def configure_name_normalizer(
+        max_size: int = DEFAULT_NAME_NORMALIZATION_CACHE_SIZE) -> (
+        NameNormalizer):
+    """
+    Replace the shared name normalizer with one using the given cache size.
+    Meant to be called once at startup.
+    """
+    global _shared_name_normalizer
+    with _shared_name_normalizer_lock:
+        _shared_name_normalizer = NameNormalizer(max_size)
+
+    return _shared_name_normalizer
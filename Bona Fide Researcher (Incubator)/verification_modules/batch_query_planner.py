@@ -0,0 +1,155 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Hashable, Iterable, List, Tuple
+
+from models.researcher import Researcher
+from utils.name_normalization import get_name_normalizer
+
+if TYPE_CHECKING:
+    from verification_modules.composable.base_verification_module import \
+        BaseVerificationModule
+
+
+def get_normalized_name_key(given_name: str, surname: str,
+                            order_sensitive: bool = True) -> Tuple:
+    """
+    Build a key of the researcher's name that ignores letter case and
+    whitespace differences, and optionally also the order of the names.
+    """
+    name_normalizer = get_name_normalizer()
+    names = tuple(name_normalizer.casefold(name)
+                  for name in (given_name, surname))
+    if not order_sensitive:
+        names = tuple(sorted(names))
+
+    return names
+
+
+class _SharedQuery:
+    def __init__(self, consumer_count: int):
+        self.remaining_consumers = consumer_count
+        self.result_pages = Future()
+
+
+class BatchQueryPlanner:
+    """
+    Shares upstream queries among the researchers of a single batch request.
+    Researchers are grouped by the module-specific query key (normalized
+    names and whatever else the module puts into the query). Every group runs
+    the upstream query once and the raw result pages are handed to the
+    filter of each researcher in the group. Researchers with a unique query
+    do not go through the planner at all, so their pages are still streamed.
+    Every job of the batch withdraws its researcher once it ends, so the pages
+    are not kept for a researcher whose job never reached the module.
+    """
+    def __init__(self, researchers: Iterable[Researcher]):
+        # researchers without both names are skipped by the modules
+        self.researchers = [researcher for researcher in researchers
+                            if researcher.given_name and researcher.surname]
+        self._lock = threading.Lock()
+        # data source -> Counter of query keys
+        self._query_key_counts = {}
+        # data source -> module the query keys were counted with
+        self._modules = {}
+        # researchers which will not query anything more
+        self._withdrawn_researchers = []
+        # id(researcher) -> data sources the researcher has already queried
+        self._queried_data_sources = {}
+        # (data source, query key) -> _SharedQuery
+        self._shared_queries = {}
+
+    def _get_query_key_count(self, module: "BaseVerificationModule",
+                             query_key: Hashable) -> int:
+        # expects the lock to be held by the caller
+        query_key_counts = self._query_key_counts.get(module.data_source_name)
+        if query_key_counts is None:
+            query_key_counts = Counter(module.get_query_key(researcher)
+                                       for researcher in self.researchers)
+            query_key_counts.subtract(
+                module.get_query_key(researcher)
+                for researcher in self._withdrawn_researchers)
+            self._query_key_counts[module.data_source_name] = query_key_counts
+            self._modules[module.data_source_name] = module
+
+        return query_key_counts[query_key]
+
+    def _release_consumer(self, shared_query_key: Tuple,
+                          shared_query: _SharedQuery) -> None:
+        # expects the lock to be held by the caller
+        shared_query.remaining_consumers -= 1
+        # the last consumer releases the raw pages
+        if shared_query.remaining_consumers <= 0:
+            self._shared_queries.pop(shared_query_key, None)
+
+    def withdraw(self, researcher: Researcher) -> None:
+        """
+        Remove a researcher of the batch which will not query anything more -
+        its job ended (whether it queried all the modules or not) or it was
+        coalesced with an identical job in flight. The other researchers of
+        its groups do not keep the pages for it.
+        """
+        with self._lock:
+            queried_data_sources = self._queried_data_sources.pop(
+                id(researcher), set())
+            if not researcher.given_name or not researcher.surname:
+                return
+
+            self._withdrawn_researchers.append(researcher)
+            for data_source_name, query_key_counts in (
+                    self._query_key_counts.items()):
+                if data_source_name in queried_data_sources:
+                    continue
+
+                query_key = self._modules[data_source_name].get_query_key(
+                    researcher)
+                query_key_counts[query_key] -= 1
+
+                shared_query_key = (data_source_name, query_key)
+                shared_query = self._shared_queries.get(shared_query_key)
+                if shared_query is not None:
+                    self._release_consumer(shared_query_key, shared_query)
+
+    def get_result_pages(self, module: "BaseVerificationModule",
+                         researcher: Researcher) -> Iterable[List]:
+        """
+        :returns: raw result pages of the module's query for the researcher,
+        shared with the other researchers of the same group
+        """
+        query_key = module.get_query_key(researcher)
+        shared_query_key = (module.data_source_name, query_key)
+
+        with self._lock:
+            consumer_count = self._get_query_key_count(module, query_key)
+            self._queried_data_sources.setdefault(id(researcher), set()).add(
+                module.data_source_name)
+            if consumer_count <= 1:
+                return module.iter_result_pages(researcher)
+
+            shared_query = self._shared_queries.get(shared_query_key)
+            is_leader = shared_query is None
+            if is_leader:
+                shared_query = _SharedQuery(consumer_count)
+                self._shared_queries[shared_query_key] = shared_query
+
+        if is_leader:
+            try:
+                shared_query.result_pages.set_result(
+                    list(module.iter_result_pages(researcher)))
+            except Exception as e:
+                shared_query.result_pages.set_exception(e)
+
+        try:
+            return shared_query.result_pages.result()
+        finally:
+            # also when the query failed
+            with self._lock:
+                self._release_consumer(shared_query_key, shared_query)
@@ -6,26 +6,75 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
-from typing import List, Tuple
+from datetime import datetime
+from typing import Hashable, Iterator, List, Tuple
 
 from arxiv import Client, Result, Search, SortCriterion, SortOrder
-from unidecode import unidecode
 
+from caching.caching import ResponseCache
 from models.author import Author
-from models.name_matcher import NameMatcher
+from models.name_matcher import TargetNameMatcher
 from models.researcher import Researcher
 from models.search_results.arxiv_search_result import ArxivSearchResult
 from models.search_results.unified_search_result import UnifiedSearchResult
+from utils.http_client import PooledHttpClient
+from verification_modules.batch_query_planner import get_normalized_name_key
 from verification_modules.composable.base_verification_module import BaseVerificationModule
 
 
+def _serialize_result(result: Result) -> dict:
+    """
+    Convert the arXiv result to JSON serializable data for the response
+    cache.
+    """
+    return {
+        "entry_id": result.entry_id,
+        "updated": result.updated.isoformat(),
+        "published": result.published.isoformat(),
+        "title": result.title,
+        "authors": [author.name for author in result.authors],
+        "summary": result.summary,
+        "comment": result.comment,
+        "journal_ref": result.journal_ref,
+        "doi": result.doi,
+        "primary_category": result.primary_category,
+        "categories": result.categories,
+        "links": [[link.href, link.title, link.rel, link.content_type]
+                  for link in result.links],
+    }
+
+
+def _deserialize_result(data: dict) -> Result:
+    """
+    Rebuild the arXiv result from the data of the response cache.
+    """
+    return Result(
+        entry_id=data["entry_id"],
+        updated=datetime.fromisoformat(data["updated"]),
+        published=datetime.fromisoformat(data["published"]),
+        title=data["title"],
+        authors=[Result.Author(name) for name in data["authors"]],
+        summary=data["summary"],
+        comment=data["comment"],
+        journal_ref=data["journal_ref"],
+        doi=data["doi"],
+        primary_category=data["primary_category"],
+        categories=data["categories"],
+        links=[Result.Link(*link) for link in data["links"]])
+
+
 class ArxivVerificationModule(BaseVerificationModule):
-    def __init__(self, verbose: bool = False):
-        super().__init__(verbose, "arXiv")
+    def __init__(self, verbose: bool = False,
+                 http_client: PooledHttpClient = None,
+                 response_cache: ResponseCache = None):
+        super().__init__(verbose, "arXiv", http_client, response_cache)
         self.module_name = "Arxiv Verification Module"
         # critical threshold for which name is considered a match (X out of 100)
         self._NAME_MATCH_THRESHOLD = 65
         self._MAX_RESULTS_LIMIT = 50
+        # the arxiv library manages its own session and rate limiting, a single
+        # client per module keeps its connection alive between the queries
+        self._arxiv_client = Client()
 
     def print_reduced_result(self, result_items: List[Author]) -> None:
         for item in result_items:
@@ -57,9 +106,16 @@ class ArxivVerificationModule(BaseVerificationModule):
             List of publications matching the search criteria
         """
         if transliterate_name:
-            author_name = unidecode(author_name)
+            author_name = self.name_normalizer.transliterate(author_name)
 
         search_query = f"au:\"{author_name}\""
+        cache_query = {"query": search_query, "max_results": max_results}
+
+        if self.response_cache:
+            cached_results = self.response_cache.get(self.data_source_name,
+                                                     cache_query)
+            if cached_results is not None:
+                return [_deserialize_result(data) for data in cached_results]
 
         search = Search(
             query=search_query,
@@ -68,8 +124,13 @@ class ArxivVerificationModule(BaseVerificationModule):
             sort_order=SortOrder.Descending
         )
 
-        client = Client()
-        results = list(client.results(search))
+        results = list(self._arxiv_client.results(search))
+
+        if self.response_cache:
+            self.response_cache.set(self.data_source_name, cache_query, 0,
+                                    [_serialize_result(result)
+                                     for result in results])
+
         return results
 
     def filter_results(self, unfiltered_items: List[Result],
@@ -79,21 +140,30 @@ class ArxivVerificationModule(BaseVerificationModule):
         target_given_name, target_surname = (researcher.given_name,
                                              researcher.surname)
 
+        # all the authors of the page are scored at once
+        name_matcher = TargetNameMatcher(
+            target_given_name, target_surname,
+            researcher.has_uncertain_name_order,
+            score_cutoff=self._NAME_MATCH_THRESHOLD * 2)
+        candidate_names = [self._parse_name(author.name)
+                           for item in unfiltered_items
+                           for author in item.authors]
+        name_match_ratios = iter(name_matcher.get_name_match_ratios(
+            candidate_names))
+        self.print_name_matching_stats(name_matcher)
+        candidate_names = iter(candidate_names)
+
         # TODO - refactor for new author entity with Institution attr
         for item in unfiltered_items:
-            name_matcher = NameMatcher(researcher.has_uncertain_name_order)
             author_objects = []
             matched_author = None
 
-            for author in item.authors:
-                candidate_given_name, candidate_surname = self._parse_name(
-                    author.name)
+            for _ in item.authors:
+                candidate_given_name, candidate_surname = next(candidate_names)
                 author_object = Author(candidate_given_name, candidate_surname)
                 author_objects.append(author_object)
 
-                name_match_ratio = name_matcher.get_name_match_ratio(
-                    candidate_given_name, candidate_surname, target_given_name,
-                    target_surname)
+                name_match_ratio = next(name_match_ratios)
 
                 if name_match_ratio >= self._NAME_MATCH_THRESHOLD * 2:
                     matched_author = author_object
@@ -109,31 +179,40 @@ class ArxivVerificationModule(BaseVerificationModule):
                     title=item.title,
                     summary=item.summary,
                     domains=item.categories,
-                    raw_data=item)
+                    raw_data=self.get_raw_data(item))
 
                 filtered_items.append(matched_result)
 
         return filtered_items
 
-    def get_researcher_info(self, researcher: Researcher) -> List[
-        ArxivSearchResult]:
-        result_items = []
+    def _get_name_variations(self, researcher: Researcher) -> List[
+        Tuple[str, str]]:
         name_variations = [(researcher.given_name, researcher.surname)]
 
         if researcher.has_uncertain_name_order:
             name_variations.append((researcher.surname, researcher.given_name))
 
-        for given_name, surname in name_variations:
-            full_name = f"{given_name} {surname}"
-            current_items = self.search_arxiv_publications(full_name,
-                                                      self._MAX_RESULTS_LIMIT,
-                                                      True)
-            result_items.extend(current_items)
+        return name_variations
+
+    def get_query_key(self, researcher: Researcher) -> Hashable:
+        # names are transliterated before querying
+        name_key = get_normalized_name_key(
+            self.name_normalizer.transliterate(researcher.given_name),
+            self.name_normalizer.transliterate(researcher.surname),
+            order_sensitive=not researcher.has_uncertain_name_order)
 
-        filtered_result_items = self.filter_results(result_items, researcher)
-        print(f"Obtained researcher info from {self.data_source_name}")
+        return name_key, researcher.has_uncertain_name_order
 
-        return filtered_result_items
+    def iter_result_pages(self, researcher: Researcher) -> Iterator[
+        List[Result]]:
+        """
+        :returns: generator of raw result lists (one per name variation)
+        """
+        for given_name, surname in self._get_name_variations(researcher):
+            full_name = f"{given_name} {surname}"
+            yield self.search_arxiv_publications(full_name,
+                                                 self._MAX_RESULTS_LIMIT,
+                                                 True)
 
     def get_unified_search_results(self, search_results: List[
         ArxivSearchResult]) -> List[UnifiedSearchResult]:
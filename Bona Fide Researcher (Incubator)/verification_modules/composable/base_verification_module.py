@@ -7,17 +7,128 @@
       =
 """
 from abc import ABC, abstractmethod
-from typing import List
+from http import HTTPStatus
+from typing import Any, Hashable, Iterable, List, Tuple
 
+from caching.caching import ResponseCache, get_response_cache
+from caching.raw_data_store import RawDataReference, RawDataStore
+from models.name_matcher import TargetNameMatcher
 from models.researcher import Researcher
 from models.search_results.search_result import SearchResult
 from models.search_results.unified_search_result import UnifiedSearchResult
+from utils.http_client import PooledHttpClient, get_http_client
+from utils.name_normalization import get_name_normalizer
 
 
 class BaseVerificationModule(ABC):
-    def __init__(self, verbose: bool = False, data_source_name: str = "?"):
+    def __init__(self, verbose: bool = False, data_source_name: str = "?",
+                 http_client: PooledHttpClient = None,
+                 response_cache: ResponseCache = None):
         self.verbose = verbose
         self.data_source_name = data_source_name
+        # pooled keep-alive connections shared with the other modules
+        self.http_client = http_client or get_http_client()
+        # None when response caching is disabled
+        self.response_cache = response_cache or get_response_cache()
+        # memoized name normalization shared by all the modules
+        self.name_normalizer = get_name_normalizer()
+        # shares the upstream queries among researchers of a batch request
+        self.batch_planner = None
+        # raw items are spilled to the store when it is set, otherwise they
+        # are released together with their page
+        self.raw_data_store: RawDataStore | None = None
+
+    def get_json_page(self, url: str, params: dict, cache_query: Any,
+                      page: int = 0, headers: dict = None) -> Tuple[
+        int, Any, str]:
+        """
+        Fetch a single page of JSON results, going through the response cache
+        first. Only successful responses are cached.
+        :param url: API endpoint to query
+        :param params: request parameters
+        :param cache_query: query identifying the page in the cache (without
+        volatile parameters like cursors), None - the page is not cached
+        :param page: index of the page
+        :param headers: request headers
+        :returns: status code, decoded JSON data (None on failure) and the
+        response text (empty on success)
+        """
+        use_cache = self.response_cache and cache_query is not None
+        if use_cache:
+            cached_data = self.response_cache.get(self.data_source_name,
+                                                  cache_query, page)
+            if cached_data is not None:
+                return HTTPStatus.OK, cached_data, ""
+
+        response = self.http_client.get(url, params=params, headers=headers)
+        if response.status_code != HTTPStatus.OK:
+            return response.status_code, None, response.text
+
+        response_data = response.json()
+        if use_cache:
+            self.response_cache.set(self.data_source_name, cache_query, page,
+                                    response_data)
+
+        return response.status_code, response_data, ""
+
+    @abstractmethod
+    def get_query_key(self, researcher: Researcher) -> Hashable:
+        """
+        :returns: key identifying the upstream query made for the researcher,
+        researchers with the same key get the same raw result pages
+        """
+        pass
+
+    @abstractmethod
+    def iter_result_pages(self, researcher: Researcher) -> Iterable[List]:
+        """
+        :returns: pages of raw (unfiltered) result items for the researcher
+        """
+        pass
+
+    @abstractmethod
+    def filter_results(self, unfiltered_items: List, researcher: Researcher) \
+            -> List[SearchResult]:
+        pass
+
+    def get_raw_data(self, item: Any) -> RawDataReference | None:
+        """
+        :param item: raw item the search result was extracted from
+        :returns: reference to the item spilled to the raw data store, None
+        if raw data is not kept
+        """
+        if self.raw_data_store is None:
+            return None
+
+        return self.raw_data_store.add(item)
+
+    def print_name_matching_stats(self, name_matcher: TargetNameMatcher) -> (
+            None):
+        if self.verbose:
+            print(f"{self.data_source_name}: "
+                  f"{name_matcher.pruned_candidate_count} of "
+                  f"{name_matcher.candidate_count} candidate names pruned "
+                  f"before fuzzy matching")
+
+    def get_result_pages(self, researcher: Researcher) -> Iterable[List]:
+        if self.batch_planner is not None:
+            return self.batch_planner.get_result_pages(self, researcher)
+
+        return self.iter_result_pages(researcher)
+
+    def get_researcher_info(self, researcher: Researcher) -> List[
+        SearchResult]:
+        filtered_result_items = []
+
+        # each page is filtered as soon as it arrives, only the matched
+        # results are kept in memory
+        for page_items in self.get_result_pages(researcher):
+            filtered_result_items.extend(self.filter_results(page_items,
+                                                             researcher))
+
+        print(f"Obtained researcher info from {self.data_source_name}")
+
+        return filtered_result_items
 
     @abstractmethod
     def get_unified_search_results(self, search_results: List[SearchResult]) \
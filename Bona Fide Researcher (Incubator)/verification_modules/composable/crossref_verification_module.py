@@ -7,22 +7,25 @@
       =
 """
 from http import HTTPStatus
-from typing import List
-
-import requests
+from typing import Hashable, Iterator, List
 
+from caching.caching import ResponseCache
 from models.author import Author
 from models.search_results.crossref_search_result import CrossrefSearchResult
 from models.institution import Institution
-from models.name_matcher import NameMatcher
+from models.name_matcher import TargetNameMatcher
 from models.researcher import Researcher
 from models.search_results.unified_search_result import UnifiedSearchResult
+from utils.http_client import PooledHttpClient
+from verification_modules.batch_query_planner import get_normalized_name_key
 from verification_modules.composable.base_verification_module import BaseVerificationModule
 
 
 class CrossrefVerificationModule(BaseVerificationModule):
-    def __init__(self, verbose: bool = False):
-        super().__init__(verbose, "Crossref")
+    def __init__(self, verbose: bool = False,
+                 http_client: PooledHttpClient = None,
+                 response_cache: ResponseCache = None):
+        super().__init__(verbose, "Crossref", http_client, response_cache)
         self.module_name = "Crossref Verification Module"
         self._CROSSREF_API_URL = "https://api.crossref.org/works"
         # critical threshold for which name is considered a match (X out of 100)
@@ -50,12 +53,35 @@ class CrossrefVerificationModule(BaseVerificationModule):
         # given name + surname maximum
         name_match_threshold = self._NAME_MATCH_THRESHOLD * 2
 
+        # all the authors of the page are scored at once
+        name_matcher = TargetNameMatcher(
+            target_given_name, target_surname,
+            researcher.has_uncertain_name_order,
+            score_cutoff=name_match_threshold)
+        candidate_names = [(author.get("given", ""), author.get("family", ""))
+                           for item in unfiltered_items
+                           for author in item.get("author", [])]
+        name_match_ratios = name_matcher.get_name_match_ratios(
+            candidate_names)
+        self.print_name_matching_stats(name_matcher)
+
+        # names are scored on the raw items, authors and their affiliations
+        # are only built for the items with a matched author
+        item_ratios_start = 0
         for item in unfiltered_items:
             authors = item.get("author", [])
+            item_name_match_ratios = name_match_ratios[
+                item_ratios_start:item_ratios_start + len(authors)]
+            item_ratios_start += len(authors)
+            if not any(name_match_ratio >= name_match_threshold
+                       for name_match_ratio in item_name_match_ratios):
+                continue
+
             matched_author = None
             author_objects = []
 
-            for author in authors:
+            for author, name_match_ratio in zip(authors,
+                                                item_name_match_ratios):
                 # TODO - refactor for new author entity with Institution attr
                 json_affiliations = author.get("affiliation")
                 affiliations = set()
@@ -69,13 +95,7 @@ class CrossrefVerificationModule(BaseVerificationModule):
                                        affiliations)
 
                 author_objects.append(author_object)
-                name_matcher = NameMatcher(researcher.has_uncertain_name_order)
 
-                candidate_given_name = author.get("given", "")
-                candidate_surname = author.get("family", "")
-                name_match_ratio = name_matcher.get_name_match_ratio(
-                    candidate_given_name, candidate_surname, target_given_name,
-                    target_surname)
                 if name_match_ratio >= name_match_threshold:
                     author_object.name_match_ratio = name_match_ratio
                     matched_author = author_object
@@ -89,46 +109,82 @@ class CrossrefVerificationModule(BaseVerificationModule):
                                                      item.get("URL"),
                                                      title,
                                                      item.get("publisher"),
-                                                     item)
+                                                     self.get_raw_data(item))
                 filtered_items.append(search_result)
 
         return filtered_items
 
-    def get_researcher_info(self, researcher: Researcher) -> List[
-        CrossrefSearchResult]:
+    def get_query_key(self, researcher: Researcher) -> Hashable:
+        # the author query is matched word by word, order of names does not
+        # matter
+        return get_normalized_name_key(researcher.given_name,
+                                       researcher.surname,
+                                       order_sensitive=False)
+
+    def iter_result_pages(self, researcher: Researcher) -> Iterator[
+        List[dict]]:
+        """
+        Lazily fetch the pages of raw Crossref items, the next page is only
+        requested once the previous one has been consumed.
+        The items of every page are cached by the index of the page. Cursors
+        expire and are never taken from the cache - the cached pages are
+        streamed one by one until the first missing one, then the cursor walk
+        starts over and skips the pages that have already been yielded.
+        :param researcher: researcher to search for
+        :returns: generator of raw item lists (one per page)
+        """
+        given_name, surname = researcher.given_name, researcher.surname
+        cache_query = {
+            "query.author": f"{given_name} {surname}",
+            "rows": self.requested_rows_count,
+            # only the items of the pages are cached
+            "content": "items",
+        }
+
+        yielded_page_count = 0
+        while self.response_cache and yielded_page_count < self._PAGE_LIMIT:
+            current_items = self.response_cache.get(
+                self.data_source_name, cache_query, yielded_page_count)
+            if current_items is None:
+                break
+
+            yielded_page_count += 1
+            yield current_items
+            if len(current_items) < self.requested_rows_count:
+                return
 
-        result_items = []
         cursor = "*"
         has_all_items = False
-        given_name, surname = researcher.given_name, researcher.surname
 
         start_page = 0
         while not has_all_items and start_page < self._PAGE_LIMIT:
             params = {
                 "query.author": f"{given_name} {surname}",
-                "cursor": cursor,
                 "rows": self.requested_rows_count,
+                "cursor": cursor,
             }
-            response = requests.get(self._CROSSREF_API_URL, params=params)
-            response_data = response.json()
+            status_code, response_data, response_text = self.get_json_page(
+                self._CROSSREF_API_URL, params, None)
 
-            if response.status_code != HTTPStatus.OK:
+            if status_code != HTTPStatus.OK:
                 print(
                     f"Verification of researcher {given_name} {surname} "
-                    f"failed with the response {response.status_code} - "
-                    f"{response.text}")
+                    f"failed with the response {status_code} - "
+                    f"{response_text}")
                 has_all_items = True
             else:
                 current_items = response_data['message']['items']
-                result_items.extend(current_items)
                 cursor = response_data['message']['next-cursor']
-                start_page += 1
                 has_all_items = len(current_items) < self.requested_rows_count
-
-        filtered_result_items = self.filter_results(result_items, researcher)
-        print(f"Obtained researcher info from {self.data_source_name}")
-
-        return filtered_result_items
+                # drop the reference to the whole response before yielding
+                del response_data
+                if self.response_cache:
+                    self.response_cache.set(self.data_source_name,
+                                            cache_query, start_page,
+                                            current_items)
+                start_page += 1
+                if start_page > yielded_page_count:
+                    yield current_items
 
     def get_unified_search_results(self, search_results: List[CrossrefSearchResult]) -> List[UnifiedSearchResult]:
         unified_search_results = []
@@ -6,23 +6,30 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from typing import List
-
-import requests
+from typing import Hashable, Iterator, List
 
+from caching.caching import ResponseCache
 from models.author import Author
 from models.search_results.eosc_search_result import EoscSearchResult
 from models.institution import Institution
-from models.name_matcher import NameMatcher
+from models.name_matcher import TargetNameMatcher
 from models.researcher import Researcher
 from models.search_results.unified_search_result import UnifiedSearchResult
+from utils.http_client import PooledHttpClient
+from verification_modules.batch_query_planner import get_normalized_name_key
 from verification_modules.composable.base_verification_module import BaseVerificationModule
 
 
 class EoscVerificationModule(BaseVerificationModule):
-    def __init__(self, verbose: bool = False, requested_rows_count: int = 20):
-        super().__init__(verbose, "EOSC Resource Hub")
+    def __init__(self, verbose: bool = False, requested_rows_count: int = 20,
+                 http_client: PooledHttpClient = None,
+                 response_cache: ResponseCache = None,
+                 parallel_page_fetching: bool = True,
+                 page_fetch_window: int = 3):
+        super().__init__(verbose, "EOSC Resource Hub", http_client,
+                         response_cache)
         self.module_name = "EOSC Resource Hub Verification Module"
         self._EOSC_API_URL = ("https://api.open-science-cloud.ec.europa.eu"
                               "/action/catalogue/items")
@@ -32,6 +39,10 @@ class EoscVerificationModule(BaseVerificationModule):
         self._REQUESTED_ROWS_PAGE_LIMIT = 20
         # how many pages of results to fetch
         self._PAGE_LIMIT = 5
+        # pages are independently addressable, so they can be requested
+        # concurrently - at most page_fetch_window of them at once
+        self.parallel_page_fetching = parallel_page_fetching
+        self.page_fetch_window = max(1, page_fetch_window)
 
         if requested_rows_count <= self._REQUESTED_ROWS_PAGE_LIMIT:
             self._REQUESTED_ROWS_COUNT = requested_rows_count
@@ -49,11 +60,14 @@ class EoscVerificationModule(BaseVerificationModule):
         name_match_threshold = self._NAME_MATCH_THRESHOLD * 2
         target_given_name, target_surname = (researcher.given_name,
                                              researcher.surname)
+
+        # listed authors with at least two name parts are the candidates,
+        # all the candidates of the page are scored at once
+        item_candidates = []
+        candidate_names = []
         for item in unfiltered_items:
+            candidates = []
             authors = item.get("source", {}).get("contributions", [])
-            matched_author = None
-            author_objects = []
-
             for author in authors:
                 if not author.get("is_listed_author", False):
                     continue
@@ -65,25 +79,48 @@ class EoscVerificationModule(BaseVerificationModule):
                 if not len(person_names_cleaned) >= 2:
                     continue
 
-                candidate_given_name = person_names_cleaned[0]
-                candidate_surname = person_names_cleaned[-1]
-                name_matcher = NameMatcher(researcher.has_uncertain_name_order)
-
-                name_match_ratio = name_matcher.get_name_match_ratio(
-                    candidate_given_name, candidate_surname, target_given_name,
-                    target_surname)
-                data_source = item.get("source", {})
+                candidate_name = (person_names_cleaned[0],
+                                  person_names_cleaned[-1])
+                candidates.append((person, candidate_name))
+                candidate_names.append(candidate_name)
+            item_candidates.append(candidates)
+
+        name_matcher = TargetNameMatcher(
+            target_given_name, target_surname,
+            researcher.has_uncertain_name_order,
+            score_cutoff=name_match_threshold)
+        name_match_ratios = name_matcher.get_name_match_ratios(
+            candidate_names)
+        self.print_name_matching_stats(name_matcher)
+
+        # names are scored on the raw items, authors and institutions are
+        # only built for the items with a matched author
+        item_ratios_start = 0
+        for item, candidates in zip(unfiltered_items, item_candidates):
+            item_name_match_ratios = name_match_ratios[
+                item_ratios_start:item_ratios_start + len(candidates)]
+            item_ratios_start += len(candidates)
+            if not any(name_match_ratio >= name_match_threshold
+                       for name_match_ratio in item_name_match_ratios):
+                continue
+
+            data_source = item.get("source", {})
+            # organizations are the same for all the authors of the item
+            orgs = data_source.get("relevant_organizations", [])
+            item_institutions = [Institution(org.get("name"), org.get("ror"),
+                                             org.get("isni"))
+                                 for org in orgs]
 
-                institutions = set()
-                orgs = data_source.get("relevant_organizations", [])
-                for org in orgs:
-                    institution = Institution(org.get("name"), org.get("ror"),
-                                              org.get("isni"))
-                    institutions.add(institution)
+            matched_author = None
+            author_objects = []
 
+            for (person, (candidate_given_name, candidate_surname)), \
+                    name_match_ratio in zip(candidates,
+                                            item_name_match_ratios):
+                # every author needs its own set, merging authors updates it
                 author_object = Author(candidate_given_name,
                                        candidate_surname,
-                                       affiliations=institutions,
+                                       affiliations=set(item_institutions),
                                        orcid=person.get("orcid"))
                 author_objects.append(author_object)
 
@@ -91,86 +128,143 @@ class EoscVerificationModule(BaseVerificationModule):
                     author_object.name_match_ratio = name_match_ratio
                     matched_author = author_object
 
-                if matched_author:
-                    raw_domains = data_source.get("domain", [])
-                    domains = [d.get("domain", "?") for d in raw_domains]
-
-                    doi = "?"
-                    identifiers = data_source.get("identifiers", [])
-                    for identifier in identifiers:
-                        if identifier.get("scheme", "?") == "doi":
-                            doi = identifier.get("value", "?")
-                            break
-
-                    title = "?"
-                    titles_collection = data_source.get("titles", {})
-                    for titles in titles_collection.values():
-                        if len(titles) > 0:
-                            title = titles[0]
-
-                    urls = set()
-                    publishers = set()
-                    manifestations = data_source.get("manifestations", [])
-                    for manifestation in manifestations:
-                        url = manifestation.get("url")
-                        if url:
-                            urls.add(url)
-
-                        publisher = manifestation.get("venue", {}).get("name")
-                        if publisher:
-                            publishers.add(publisher)
-
-                    search_result = EoscSearchResult(matched_author,
-                                                     author_objects,
-                                                     doi,
-                                                     urls,
-                                                     publishers,
-                                                     title,
-                                                     domains,
-                                                     item)
-
-                    filtered_items.append(search_result)
+            # a single search result per item, with all its authors
+            if matched_author:
+                search_result = self._create_search_result(
+                    item, matched_author, author_objects)
+                filtered_items.append(search_result)
 
         return filtered_items
 
-    def get_researcher_info(self, researcher: Researcher) -> List[
-        EoscSearchResult]:
-        result_items = []
+    def _create_search_result(self, item: dict, matched_author: Author,
+                              author_objects: List[Author]) -> (
+            EoscSearchResult):
+        data_source = item.get("source", {})
+        raw_domains = data_source.get("domain", [])
+        domains = [d.get("domain", "?") for d in raw_domains]
+
+        doi = "?"
+        identifiers = data_source.get("identifiers", [])
+        for identifier in identifiers:
+            if identifier.get("scheme", "?") == "doi":
+                doi = identifier.get("value", "?")
+                break
+
+        title = "?"
+        titles_collection = data_source.get("titles", {})
+        for titles in titles_collection.values():
+            if len(titles) > 0:
+                title = titles[0]
+
+        urls = set()
+        publishers = set()
+        manifestations = data_source.get("manifestations", [])
+        for manifestation in manifestations:
+            url = manifestation.get("url")
+            if url:
+                urls.add(url)
+
+            publisher = manifestation.get("venue", {}).get("name")
+            if publisher:
+                publishers.add(publisher)
+
+        return EoscSearchResult(matched_author, author_objects, doi, urls,
+                                publishers, title, domains,
+                                self.get_raw_data(item))
+
+    def get_query_key(self, researcher: Researcher) -> Hashable:
+        # order of names does not matter in EOSC search
+        return get_normalized_name_key(researcher.given_name,
+                                       researcher.surname,
+                                       order_sensitive=False)
+
+    def fetch_result_page(self, researcher: Researcher, page: int) -> (
+            List[dict] | None):
+        """
+        :returns: raw items of the given result page or None if the request
+        failed
+        """
         given_name = researcher.given_name
         surname = researcher.surname
 
+        print(f"start_page: {page + 1} of {self._PAGE_LIMIT}")
+        cache_query = {
+            # order of names does not matter in EOSC search
+            "query": f"{given_name} {surname}",
+            "exact": "false",
+            "catalogue": "all",
+            "orderBy": "relevance",
+            "order": "desc",
+        }
+        params = {**cache_query, "page": page}
+        status_code, response_data, response_text = self.get_json_page(
+            self._EOSC_API_URL, params, cache_query, page)
+
+        if status_code != HTTPStatus.OK:
+            print(
+                f"Verification of researcher {given_name} {surname} "
+                f"failed with the response {status_code} - "
+                f"{response_text}")
+            return None
+
+        return response_data['result']['items']
+
+    def _is_last_page(self, page_items: List[dict] | None) -> bool:
+        return (page_items is None or
+                len(page_items) < self._REQUESTED_ROWS_COUNT)
+
+    def iter_result_pages_sequential(self, researcher: Researcher) -> Iterator[
+        List[dict]]:
         start_page = 0
         has_all_items = False
         while not has_all_items and start_page < self._PAGE_LIMIT:
-            print(f"start_page: {start_page + 1} of {self._PAGE_LIMIT}")
-            params = {
-                # order of names does not matter in EOSC search
-                "query": f"{given_name} {surname}",
-                "exact": "false",
-                "catalogue": "all",
-                "page": start_page,
-                "orderBy": "relevance",
-                "order": "desc",
-            }
-            response = requests.get(self._EOSC_API_URL, params=params)
-            response_data = response.json()
-
-            if response.status_code != HTTPStatus.OK:
-                print(
-                    f"Verification of researcher {given_name} {surname} "
-                    f"failed with the response {response.status_code} - "
-                    f"{response.text}")
-                has_all_items = True
-            else:
-                current_items = response_data['result']['items']
-                result_items.extend(current_items)
-                start_page += 1
-                has_all_items = len(current_items) < self._REQUESTED_ROWS_COUNT
-
-        filtered_result_items = self.filter_results(result_items, researcher)
-        print(f"Obtained researcher info from {self.data_source_name}")
-
-        return filtered_result_items
+            current_items = self.fetch_result_page(researcher, start_page)
+            has_all_items = self._is_last_page(current_items)
+            start_page += 1
+
+            if current_items is not None:
+                yield current_items
+
+    def iter_result_pages_parallel(self, researcher: Researcher) -> Iterator[
+        List[dict]]:
+        """
+        Fetch the result pages concurrently with a bounded window of pages in
+        flight. Pages are yielded in their original (relevance) order and the
+        outstanding requests are cancelled once a short or failed page marks
+        the end of the results.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.page_fetch_window,
+                                      thread_name_prefix="eosc-page")
+        pending_pages = {}
+        next_page_to_submit = 0
+
+        try:
+            for page in range(self._PAGE_LIMIT):
+                while (next_page_to_submit < self._PAGE_LIMIT and
+                       len(pending_pages) < self.page_fetch_window):
+                    pending_pages[next_page_to_submit] = executor.submit(
+                        self.fetch_result_page, researcher,
+                        next_page_to_submit)
+                    next_page_to_submit += 1
+
+                current_items = pending_pages.pop(page).result()
+                if current_items is not None:
+                    yield current_items
+
+                if self._is_last_page(current_items):
+                    break
+        finally:
+            # pages past the end of the results are not needed anymore
+            for future in pending_pages.values():
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_result_pages(self, researcher: Researcher) -> Iterator[
+        List[dict]]:
+        if self.parallel_page_fetching and self.page_fetch_window > 1:
+            return self.iter_result_pages_parallel(researcher)
+
+        return self.iter_result_pages_sequential(researcher)
 
     def get_unified_search_results(self, search_results: List[EoscSearchResult]) -> List[UnifiedSearchResult]:
         unified_search_results = []
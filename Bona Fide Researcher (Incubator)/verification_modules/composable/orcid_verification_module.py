@@ -7,22 +7,26 @@
       =
 """
 from http import HTTPStatus
-from typing import List
-
-import requests
+from typing import Hashable, Iterator, List, Tuple
 
+from caching.caching import ResponseCache
 from models.author import Author
 from models.institution import Institution
-from models.name_matcher import NameMatcher
+from models.name_matcher import TargetNameMatcher
 from models.search_results.orcid_search_result import OrcidSearchResult
 from models.researcher import Researcher
 from models.search_results.unified_search_result import UnifiedSearchResult
+from utils.http_client import PooledHttpClient
+from utils.name_normalization import get_name_normalizer
+from verification_modules.batch_query_planner import get_normalized_name_key
 from verification_modules.composable.base_verification_module import BaseVerificationModule
 
 
 class OrcidVerificationModule(BaseVerificationModule):
-    def __init__(self, verbose: bool = False, requested_rows_count: int = 1000):
-        super().__init__(verbose, "ORCID")
+    def __init__(self, verbose: bool = False, requested_rows_count: int = 1000,
+                 http_client: PooledHttpClient = None,
+                 response_cache: ResponseCache = None):
+        super().__init__(verbose, "ORCID", http_client, response_cache)
         self.module_name = "ORCID Verification Module"
         self._ORCID_API_URL = "https://pub.orcid.org/v3.0/expanded-search/"
         # critical threshold for which name is considered a match (X out of 100)
@@ -45,8 +49,25 @@ class OrcidVerificationModule(BaseVerificationModule):
         target_given_name, target_surname = (researcher.given_name,
                                              researcher.surname)
 
+        # all the candidates of the page are scored at once
+        name_matcher = TargetNameMatcher(
+            target_given_name, target_surname,
+            researcher.has_uncertain_name_order,
+            score_cutoff=self._NAME_MATCH_THRESHOLD * 2)
+        candidate_names = [(item.get("given-names", ""),
+                            item.get("family-names", ""))
+                           for item in unfiltered_items]
+        name_match_ratios = name_matcher.get_name_match_ratios(
+            candidate_names)
+        self.print_name_matching_stats(name_matcher)
+
+        # names are scored on the raw items, authors and institutions are
+        # only built for the matched ones
         # TODO - refactor for new author entity with Institution attr
-        for item in unfiltered_items:
+        for item, name_match_ratio in zip(unfiltered_items, name_match_ratios):
+            if name_match_ratio < self._NAME_MATCH_THRESHOLD * 2:
+                continue
+
             json_affiliations = item.get("institution-name")
             affiliations = set()
             for institution_name in json_affiliations:
@@ -57,30 +78,42 @@ class OrcidVerificationModule(BaseVerificationModule):
                                    affiliations,
                                    item.get("email"),
                                    item.get("orcid-id"))
-            matched_result = OrcidSearchResult(author_object, item)
-            name_matcher = NameMatcher(researcher.has_uncertain_name_order)
-
-            candidate_given_name = item.get("given-names", "")
-            candidate_surname = item.get("family-names", "")
-            name_match_ratio = name_matcher.get_name_match_ratio(
-                candidate_given_name, candidate_surname, target_given_name,
-                target_surname)
-
-            if name_match_ratio >= self._NAME_MATCH_THRESHOLD * 2:
-                author_object.name_match_ratio = name_match_ratio
-                filtered_items.append(matched_result)
+            author_object.name_match_ratio = name_match_ratio
+            matched_result = OrcidSearchResult(author_object,
+                                               self.get_raw_data(item))
+            filtered_items.append(matched_result)
 
         return filtered_items
 
-    def get_researcher_info(self, researcher: Researcher) -> List[
-        OrcidSearchResult]:
-        result_items = []
+    def _get_name_variations(self, researcher: Researcher) -> List[
+        Tuple[str, str]]:
         name_variations = [(researcher.given_name, researcher.surname)]
 
         if researcher.has_uncertain_name_order:
             name_variations.append((researcher.surname, researcher.given_name))
 
-        for given_name, surname in name_variations:
+        return name_variations
+
+    def get_query_key(self, researcher: Researcher) -> Hashable:
+        # the query combines all the known attributes of the researcher
+        name_key = get_normalized_name_key(
+            researcher.given_name, researcher.surname,
+            order_sensitive=not researcher.has_uncertain_name_order)
+        name_normalizer = get_name_normalizer()
+        other_attributes = tuple(
+            name_normalizer.casefold(attribute)
+            for attribute in (researcher.orcid, researcher.email,
+                              researcher.affiliation))
+
+        return (name_key, researcher.has_uncertain_name_order,
+                other_attributes)
+
+    def iter_result_pages(self, researcher: Researcher) -> Iterator[
+        List[dict]]:
+        """
+        :returns: generator of raw item lists (one per name variation)
+        """
+        for given_name, surname in self._get_name_variations(researcher):
             params = {
                 "q": f"family-name:{surname} OR "
                      f"given-names:{given_name} OR "
@@ -94,23 +127,16 @@ class OrcidVerificationModule(BaseVerificationModule):
                 "rows": self._REQUESTED_ROWS_COUNT
             }
             headers = {"Accept": "application/json"}
-            response = requests.get(self._ORCID_API_URL, params=params,
-                                    headers=headers)
-            response_data = response.json()
+            status_code, response_data, response_text = self.get_json_page(
+                self._ORCID_API_URL, params, params, headers=headers)
 
-            if response.status_code != HTTPStatus.OK:
+            if status_code != HTTPStatus.OK:
                 print(
                     f"Verification of researcher {given_name} {surname} ("
                     f"given name - surname) failed with the response "
-                    f"{response.status_code} - {response.text}")
+                    f"{status_code} - {response_text}")
             else:
-                current_items = response_data['expanded-result']
-                result_items.extend(current_items)
-
-        filtered_result_items = self.filter_results(result_items, researcher)
-        print(f"Obtained researcher info from {self.data_source_name}")
-
-        return filtered_result_items
+                yield response_data['expanded-result']
 
     def get_unified_search_results(self, search_results: List[
         OrcidSearchResult]) -> List[UnifiedSearchResult]:
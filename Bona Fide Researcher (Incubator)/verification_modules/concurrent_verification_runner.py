@@ -0,0 +1,74 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List
+
+from models.researcher import Researcher
+from models.search_results_aggregator import SearchResultsAggregator
+from verification_modules.composable.base_verification_module import \
+    BaseVerificationModule
+from verification_modules.self_contained.self_contained_verification_module \
+    import SelfContainedVerificationModule
+
+
+class ConcurrentVerificationRunner:
+    """
+    Fans the verification of a single researcher out to all verification
+    modules at once. Every module spends most of its time waiting for an
+    upstream API, so running them in parallel threads makes the total
+    verification time roughly equal to the slowest data source instead of the
+    sum of all of them.
+    """
+    def __init__(self, composable_modules: List[BaseVerificationModule],
+                 self_contained_modules: List[
+                     SelfContainedVerificationModule] = None,
+                 max_workers: int = None):
+        self.composable_modules = composable_modules
+        self.self_contained_modules = self_contained_modules or []
+        # one thread per module by default - every module gets its own lane
+        if max_workers is None:
+            max_workers = max(1, len(self.composable_modules) +
+                              len(self.self_contained_modules))
+        self.max_workers = max_workers
+
+    def run(self, researcher: Researcher,
+            search_results_aggregator: SearchResultsAggregator) -> Dict[
+        str, dict]:
+        """
+        Run all the modules concurrently. Results of composable modules are
+        added to the aggregator as soon as the respective module finishes
+        (the aggregator itself is only touched from the calling thread).
+        :param researcher: researcher to verify
+        :param search_results_aggregator: aggregator collecting the composable
+        results
+        :returns: results of the active self-contained modules keyed by their
+        API name
+        """
+        self_contained_results = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="verification") as executor:
+            composable_futures: Dict[Future, BaseVerificationModule] = {
+                executor.submit(module.verify, researcher): module
+                for module in self.composable_modules
+            }
+            self_contained_futures: Dict[
+                Future, SelfContainedVerificationModule] = {
+                executor.submit(module.verify, researcher): module
+                for module in self.self_contained_modules
+                if module.is_active
+            }
+
+            for future in as_completed(composable_futures):
+                search_results_aggregator.add_results(future.result())
+
+            for future, module in self_contained_futures.items():
+                self_contained_results[module.api_name] = future.result()
+
+        return self_contained_results
@@ -8,10 +8,14 @@
 """
 from argparse import ArgumentParser, Namespace
 
+from caching.raw_data_store import RawDataStore
 from enums.result_presentation_mode import ResultPresentationMode
 from models.researcher import Researcher
 from models.search_results_aggregator import SearchResultsAggregator
 from utils.formatting import print_delimiter_large
+from verification_modules.batch_query_planner import BatchQueryPlanner
+from verification_modules.concurrent_verification_runner import \
+    ConcurrentVerificationRunner
 from verification_modules.composable.arxiv_verification_module import \
     ArxivVerificationModule
 from verification_modules.composable.crossref_verification_module import \
@@ -66,6 +70,9 @@ def get_args_from_cli() -> Namespace:
                              "verified (ROR, ISNI or name)")
     parser.add_argument("-l", "--limit-results", type=int, default=-1,
                         help="Limit the output results to first N by rank")
+    parser.add_argument("-la", "--limit-articles", type=int, default=-1,
+                        help="Limit the articles of each result to first N "
+                             "by rank")
 
     # switches
     parser.add_argument("-u", "--uncertain-name-order", action="store_true",
@@ -81,16 +88,22 @@ def get_args_from_cli() -> Namespace:
 
     return parser.parse_args()
 
+def get_researcher_from_args(args: Namespace) -> Researcher:
+    return Researcher(args.given_name, args.surname, args.email, args.orcid,
+                      args.affiliation, args.uncertain_name_order)
+
+
 def verify_eduperson(args: Namespace = None, presentation_mode:
-ResultPresentationMode = ResultPresentationMode.CLI):
+ResultPresentationMode = ResultPresentationMode.CLI,
+                     batch_planner: BatchQueryPlanner = None,
+                     keep_raw_data: bool = None,
+                     columnar_ranking: bool = False):
     if args is None:
         args = get_args_from_cli()
 
     print_args_overview(args)
 
-    researcher = Researcher(args.given_name, args.surname, args.email,
-                            args.orcid, args.affiliation,
-                            args.uncertain_name_order)
+    researcher = get_researcher_from_args(args)
 
     # Self-contained verification modules
     # - produce individual results published once at the beginning
@@ -111,30 +124,62 @@ ResultPresentationMode = ResultPresentationMode.CLI):
                                        eosc_verification_module,
                                        arxiv_verification_module]
 
-    search_results_aggregator = SearchResultsAggregator(researcher,
-                                                        args.verbose)
+    # raw data is printed only in the verbose CLI output, it is spilled to
+    # the disk of the job meanwhile, otherwise the modules release it
+    # right away
+    if keep_raw_data is None:
+        keep_raw_data = (presentation_mode == ResultPresentationMode.CLI and
+                         args.verbose)
+    raw_data_store = RawDataStore() if keep_raw_data else None
 
+    # researchers verified within the same batch share the upstream queries,
+    # raw items of all the modules go to the store of the job
     for verification_module in composable_verification_modules:
-        verification_results = verification_module.verify(researcher)
-        search_results_aggregator.add_results(verification_results)
+        verification_module.batch_planner = batch_planner
+        verification_module.raw_data_store = raw_data_store
+
+    try:
+        return _verify_researcher(args, presentation_mode, researcher,
+                                  composable_verification_modules,
+                                  self_contained_verification_modules,
+                                  keep_raw_data, columnar_ranking)
+    finally:
+        # the other researchers of the batch do not keep the shared pages
+        # for the modules this researcher did not query
+        if batch_planner is not None:
+            batch_planner.withdraw(researcher)
+        if raw_data_store is not None:
+            raw_data_store.close()
+
+
+def _verify_researcher(args: Namespace,
+                       presentation_mode: ResultPresentationMode,
+                       researcher: Researcher,
+                       composable_verification_modules: list,
+                       self_contained_verification_modules: list,
+                       keep_raw_data: bool, columnar_ranking: bool):
+    search_results_aggregator = SearchResultsAggregator(researcher,
+                                                        args.verbose,
+                                                        keep_raw_data,
+                                                        columnar_ranking)
+
+    # all the modules are queried at once, composable results are aggregated
+    # as soon as the respective module finishes
+    verification_runner = ConcurrentVerificationRunner(
+        composable_verification_modules, self_contained_verification_modules)
+    self_contained_results = verification_runner.run(researcher,
+                                                     search_results_aggregator)
 
     if presentation_mode == ResultPresentationMode.CLI:
         # print results to console standard output
-        for verification_module in self_contained_verification_modules:
-            verification_module.verify(researcher)
-
-        search_results_aggregator.present_search_results_cli(args.limit_results)
+        search_results_aggregator.present_search_results_cli(
+            args.limit_results, args.limit_articles)
     elif presentation_mode == ResultPresentationMode.API:
         # return results in a structured (JSON) format that can be passed to
         # the API response
-        results = {}
-        for verification_module in self_contained_verification_modules:
-            if not verification_module.is_active:
-                continue
-            api_name = verification_module.api_name
-            results[api_name] = verification_module.verify(researcher)
+        results = dict(self_contained_results)
         composed_results = search_results_aggregator.get_search_results_dict(
-            args.limit_results)
+            args.limit_results, args.limit_articles)
         results["researcher_info"] = composed_results
         return results
     else:
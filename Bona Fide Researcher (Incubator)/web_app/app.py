@@ -6,21 +6,37 @@
      \_/        Incubator             |__*_*__| Union
       =
 """
-import threading
 import uuid
 from argparse import Namespace
 from http import HTTPStatus
 from typing import Tuple
 
-import requests
 from flask import Flask, Request, Response, g, jsonify
 
+from caching.caching import (CACHE_FILEPATH, CACHE_MAX_SIZE_BYTES,
+                             configure_response_cache)
 from enums.job_status import JobStatus
 from enums.result_presentation_mode import ResultPresentationMode
+from models.rank_memo import (DEFAULT_COAUTHOR_RANK_LIMIT,
+                              configure_coauthor_ranking)
 from researcher_relationship_graph import get_researcher_relationship_graph_data
 from utils.config_loader import load_config
-from verify_eduperson import verify_eduperson
+from utils.http_client import (DEFAULT_CONNECT_TIMEOUT, DEFAULT_POOL_SIZE,
+                               DEFAULT_READ_TIMEOUT, configure_http_client)
+from utils.name_normalization import (DEFAULT_NAME_NORMALIZATION_CACHE_SIZE,
+                                      configure_name_normalizer)
+from verification_modules.batch_query_planner import BatchQueryPlanner
+from verify_eduperson import get_researcher_from_args, verify_eduperson
+from web_app.job_queue import (DEFAULT_QUEUE_LIMIT, DEFAULT_WORKER_COUNT,
+                               JobQueue, JobQueueFullError)
+from web_app.job_store import (DEFAULT_JOB_EXPIRY, DEFAULT_MAX_SIZE_BYTES,
+                               InMemoryJobStore, JobStore)
 from web_app.jwt_auth import check_jwt_auth
+from web_app.request_coalescer import (RequestCoalescer,
+                                       get_researcher_request_key)
+from web_app.sqlite_job_store import (DEFAULT_JOB_STORE_FILEPATH,
+                                      DEFAULT_OWNER_TIMEOUT,
+                                      SqliteJobStore)
 from flask_cors import CORS
 
 APP_CFG_FILEPATH = "./configs/config.yaml"
@@ -28,7 +44,65 @@ APP_CFG_FILEPATH = "./configs/config.yaml"
 app_config = load_config(APP_CFG_FILEPATH)
 app = Flask(__name__)
 app.config.update(app_config)
-app.jobs = {}
+
+
+def create_job_store(config: dict) -> JobStore:
+    job_store_backend = config.get("job_store_backend", "memory")
+    job_store_args = {
+        "job_expiry": config.get("job_store_expiry", DEFAULT_JOB_EXPIRY),
+        "max_size_bytes": config.get("job_store_max_size_bytes",
+                                     DEFAULT_MAX_SIZE_BYTES),
+        "compress_results": config.get("job_store_compress_results", True),
+    }
+
+    if job_store_backend == "memory":
+        return InMemoryJobStore(**job_store_args)
+    elif job_store_backend == "sqlite":
+        # shared by all the worker processes running the app
+        return SqliteJobStore(
+            config.get("job_store_filepath", DEFAULT_JOB_STORE_FILEPATH),
+            owner_timeout=config.get("job_store_owner_timeout",
+                                     DEFAULT_OWNER_TIMEOUT),
+            **job_store_args)
+    else:
+        raise ValueError(f"Invalid job store backend configured: "
+                         f"{job_store_backend}. Supported backends are "
+                         f"'memory' and 'sqlite'.")
+
+
+# states and results of the background jobs
+app.jobs = create_job_store(app.config)
+# identical requests submitted while a job is in flight attach to that job
+app.request_coalescer = RequestCoalescer(app.jobs)
+# shared pooled client used by all the verification modules and for callbacks
+app.http_client = configure_http_client(
+    pool_size=app.config.get("http_pool_size", DEFAULT_POOL_SIZE),
+    connect_timeout=app.config.get("http_connect_timeout",
+                                   DEFAULT_CONNECT_TIMEOUT),
+    read_timeout=app.config.get("http_read_timeout", DEFAULT_READ_TIMEOUT))
+# upstream responses shared by all the jobs (and worker processes)
+app.response_cache = configure_response_cache(
+    enabled=app.config.get("response_cache_enabled", True),
+    filepath=app.config.get("response_cache_filepath", CACHE_FILEPATH),
+    source_expiry=app.config.get("response_cache_expiry"),
+    max_size_bytes=app.config.get("response_cache_max_size_bytes",
+                                  CACHE_MAX_SIZE_BYTES))
+# memoized name normalization shared by all the jobs of this process
+app.name_normalizer = configure_name_normalizer(
+    max_size=app.config.get("name_normalization_cache_size",
+                            DEFAULT_NAME_NORMALIZATION_CACHE_SIZE))
+# ranking of the coauthors of articles with huge author lists
+configure_coauthor_ranking(
+    coauthor_rank_limit=app.config.get("coauthor_rank_limit",
+                                       DEFAULT_COAUTHOR_RANK_LIMIT),
+    coauthor_rank_sampling=app.config.get("coauthor_rank_sampling", False))
+# bounded pool of workers processing the submitted jobs
+app.job_queue = JobQueue(
+    worker_count=app.config.get("job_worker_count", DEFAULT_WORKER_COUNT),
+    queue_limit=app.config.get("job_queue_limit", DEFAULT_QUEUE_LIMIT))
+# how long (in seconds) clients should wait before retrying when the queue is
+# full
+JOB_QUEUE_RETRY_AFTER = app.config.get("job_queue_retry_after", 30)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
 
@@ -71,14 +145,15 @@ def parse_integer_variable(request: Request, variable_name: str) -> (int |
 
 
 def has_valid_params(request_params: dict) -> Tuple[bool, Response]:
-    limit_results = request_params.get("limit_results")
+    for limit_name in ("limit_results", "limit_articles"):
+        limit_value = request_params.get(limit_name)
 
-    if limit_results is not None and limit_results < 1:
-        return False, Response(f"Invalid 'limit_results' value: "
-                               f"{limit_results}. The value should be an "
-                               f"integer greater than 0. Problematic request "
-                               f"part: {request_params}",
-                               status=HTTPStatus.BAD_REQUEST)
+        if limit_value is not None and limit_value < 1:
+            return False, Response(f"Invalid '{limit_name}' value: "
+                                   f"{limit_value}. The value should be an "
+                                   f"integer greater than 0. Problematic "
+                                   f"request part: {request_params}",
+                                   status=HTTPStatus.BAD_REQUEST)
 
     if not request_params.get("callback_url"):
         return False, Response(
@@ -91,63 +166,155 @@ def has_valid_params(request_params: dict) -> Tuple[bool, Response]:
     return True, placeholder_response
 
 
-def long_job_executor(jobs, job_id, func, args=None, kwargs=None,
-                      callback_url=None):
+def send_job_result(jobs: JobStore, job_id, result, callback_url=None):
+    jobs.set(job_id, {
+        "status": JobStatus.FINISHED_SUCCESS.name,
+        "result": result
+    })
+
+    try:
+        app.http_client.post(callback_url, json={
+            "job_id": job_id,
+            "status": JobStatus.FINISHED_SUCCESS.name,
+            "result": result
+        })
+    except Exception as e:
+        jobs.update(job_id, {"callback_error": str(e)})
+
+
+def long_job_executor(jobs: JobStore, job_id, func, args=None, kwargs=None,
+                      callback_url=None, coalescing_key=None):
     args = args or ()
     kwargs = kwargs or {}
+    jobs.set(job_id, {"status": JobStatus.RUNNING.name})
+    if coalescing_key is not None:
+        app.request_coalescer.set_status(coalescing_key,
+                                         JobStatus.RUNNING.name)
+
+    # the leader job first, then all the identical jobs attached to it
+    recipients = [(job_id, callback_url)]
     try:
         result = func(*args, **kwargs)
+    except Exception as e:
+        if coalescing_key is not None:
+            recipients.extend(app.request_coalescer.finish(coalescing_key))
 
-        jobs[job_id] = {
-            "status": JobStatus.FINISHED_SUCCESS.name,
-            "result": result
-        }
-
-        try:
-            requests.post(callback_url, json={
-                "job_id": job_id,
-                "status": JobStatus.FINISHED_SUCCESS.name,
-                "result": result
+        for recipient_job_id, _ in recipients:
+            jobs.set(recipient_job_id, {
+                "status": JobStatus.FINISHED_ERROR.name,
+                "error_message": str(e)
             })
-        except Exception as e:
-            jobs[job_id]["callback_error"] = str(e)
+        return
 
-    except Exception as e:
-        jobs[job_id] = {
-            "status": JobStatus.FINISHED_ERROR.name,
-            "error_message": str(e)
-        }
+    if coalescing_key is not None:
+        recipients.extend(app.request_coalescer.finish(coalescing_key))
 
+    for recipient_job_id, recipient_callback_url in recipients:
+        send_job_result(jobs, recipient_job_id, result,
+                        recipient_callback_url)
 
-def start_background_job(jobs, func, args=None, kwargs=None, callback_url=None):
+
+def abandon_coalesced_jobs(jobs: JobStore, coalescing_key, error: Exception):
+    # the leader job will never run, the jobs attached to it meanwhile are
+    # finished with the error and new identical jobs start a new flight
+    for follower_job_id, _ in app.request_coalescer.finish(coalescing_key):
+        jobs.set(follower_job_id, {
+            "status": JobStatus.FINISHED_ERROR.name,
+            "error_message": str(error)
+        })
+
+
+def start_background_job(jobs: JobStore, func, args=None, kwargs=None,
+                         callback_url=None, coalescing_key=None) -> (
+        tuple)[str, str | None]:
+    """
+    :returns: ID of the job and ID of the leader job it was attached to (None
+    if the job runs itself)
+    """
+    # space in the job queue has to be reserved by the caller, it is given
+    # back if the job cannot be started
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {"status": JobStatus.RUNNING.name}
+    is_leader = False
 
-    thread = threading.Thread(
-        target=long_job_executor,
-        args=(jobs, job_id, func, args, kwargs, callback_url),
-        daemon=True
-    )
-    thread.start()
+    try:
+        if coalescing_key is not None:
+            leader_job_id = app.request_coalescer.attach(coalescing_key,
+                                                         job_id, callback_url)
+            if leader_job_id is not None:
+                # the result of the leader job will be delivered to this job
+                # as well, the reserved worker is not needed
+                app.job_queue.release()
+                return job_id, leader_job_id
+            is_leader = True
+
+        jobs.set(job_id, {"status": JobStatus.QUEUED.name})
+    except Exception as e:
+        app.job_queue.release()
+        if is_leader:
+            abandon_coalesced_jobs(jobs, coalescing_key, e)
+        raise
 
-    return job_id
+    try:
+        # the job queue gives the space back itself
+        app.job_queue.submit(long_job_executor, jobs, job_id, func, args,
+                             kwargs, callback_url, coalescing_key)
+    except Exception as e:
+        if is_leader:
+            abandon_coalesced_jobs(jobs, coalescing_key, e)
+        raise
 
+    return job_id, None
 
-def start_background_jobs(func, namespace_args_list: list[Namespace]) -> (
+
+def start_background_jobs(func, namespace_args_list: list[Namespace],
+                          get_coalescing_key=None, job_kwargs=None) -> (
         tuple)[Response, HTTPStatus]:
     jobs = app.jobs
     job_responses = []
 
-    for namespace_args in namespace_args_list:
+    # the whole batch is either accepted or rejected
+    try:
+        app.job_queue.reserve(len(namespace_args_list))
+    except JobQueueFullError as e:
+        return Response(f"{e} Please try again later.",
+                        status=HTTPStatus.TOO_MANY_REQUESTS,
+                        headers={"Retry-After": str(JOB_QUEUE_RETRY_AFTER)})
+
+    batch_planner = (job_kwargs or {}).get("batch_planner")
+    batch_job_ids = set()
+    withdrawn_coalescing_keys = set()
+    for job_index, namespace_args in enumerate(namespace_args_list):
         callback_url = namespace_args.callback_url
-        job_id = start_background_job(jobs,
-                                      func,
-                                      args=(namespace_args,
-                                            ResultPresentationMode.API),
-                                      callback_url=callback_url)
+        coalescing_key = None
+        if get_coalescing_key is not None:
+            coalescing_key = get_coalescing_key(namespace_args)
+
+        try:
+            job_id, leader_job_id = start_background_job(
+                jobs,
+                func,
+                args=(namespace_args, ResultPresentationMode.API),
+                kwargs=job_kwargs,
+                callback_url=callback_url,
+                coalescing_key=coalescing_key)
+        except Exception:
+            # the failed job gave its space back, the rest of the batch is
+            # not started at all
+            app.job_queue.release(len(namespace_args_list) - job_index - 1)
+            raise
+
+        batch_job_ids.add(job_id)
+        # the researcher's job was coalesced with a job outside the batch, it
+        # will not consume the queries shared within the batch
+        if (batch_planner is not None and leader_job_id is not None and
+                leader_job_id not in batch_job_ids and
+                coalescing_key not in withdrawn_coalescing_keys):
+            withdrawn_coalescing_keys.add(coalescing_key)
+            batch_planner.withdraw(get_researcher_from_args(namespace_args))
+
         job_responses.append({"job_id": job_id,
                               "researcher_name": namespace_args.full_name,
-                              "status": JobStatus.RUNNING.name,
+                              "status": JobStatus.QUEUED.name,
                               "message": (f"Your job has been submitted and "
                                           f"assigned an ID: {job_id}. Please "
                                           f"wait for the response "
@@ -198,20 +365,51 @@ def verify_eduperson_endpoint():
             verify_email_domain=researcher_request.get("verify_email_domain",
                                                    False),
             limit_results=researcher_request.get("limit_results", 10),
+            limit_articles=researcher_request.get("limit_articles", -1),
             callback_url = researcher_request.get("callback_url")
         )
 
         namespace_args_list.append(namespace_args)
 
-    return start_background_jobs(verify_eduperson, namespace_args_list)
+    # researchers of a batch share the upstream queries with the same key,
+    # identical researchers are coalesced and do not query anything themselves
+    # the API results do not contain the raw data, it is dropped right away
+    job_kwargs = {"columnar_ranking": app.config.get("columnar_ranking",
+                                                     False)}
+    if len(namespace_args_list) > 1:
+        unique_namespace_args = {
+            get_researcher_request_key(namespace_args): namespace_args
+            for namespace_args in namespace_args_list}
+        batch_planner = BatchQueryPlanner(
+            get_researcher_from_args(namespace_args)
+            for namespace_args in unique_namespace_args.values())
+        job_kwargs["batch_planner"] = batch_planner
+
+    # identical researchers submitted while a verification is running share
+    # its result
+    return start_background_jobs(verify_eduperson, namespace_args_list,
+                                 get_researcher_request_key, job_kwargs)
 
 
 @app.route("/status/<job_id>")
 def get_job_status(job_id: str):
-    job_status_data = app.jobs.get(job_id,
-                                   {"status": JobStatus.NOT_FOUND.name})
+    # evicted jobs are reported as EXPIRED, unknown ones as NOT_FOUND
+    job_status_data = app.jobs.get_status_data(job_id)
     return jsonify(job_status_data)
 
+@app.route("/cache-stats")
+@check_jwt_auth
+def get_cache_stats():
+    # hit rates of this worker process, meant for sizing the caches
+    response_cache_stats = None
+    if app.response_cache:
+        response_cache_stats = app.response_cache.get_stats()
+
+    return jsonify({
+        "name_normalization": app.name_normalizer.get_stats(),
+        "response_cache": response_cache_stats,
+    })
+
 @app.route("/researcher-relationship-graph")
 @check_jwt_auth
 def get_researcher_relationship_graph():
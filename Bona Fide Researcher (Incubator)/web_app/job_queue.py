@@ -0,0 +1,80 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+DEFAULT_WORKER_COUNT = 8
+DEFAULT_QUEUE_LIMIT = 100
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class JobQueue:
+    """
+    Bounded pool of worker threads with a bounded queue of jobs waiting for a
+    free worker. Submitting is a two-step process - capacity for a whole batch
+    of jobs is reserved first (all or nothing) and the reserved jobs are
+    submitted afterwards.
+    """
+    def __init__(self, worker_count: int = DEFAULT_WORKER_COUNT,
+                 queue_limit: int = DEFAULT_QUEUE_LIMIT):
+        self.worker_count = worker_count
+        # maximum number of jobs waiting for a free worker
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=worker_count,
+                                            thread_name_prefix="job")
+        self._lock = threading.Lock()
+        # queued + running + reserved jobs
+        self._pending_count = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.worker_count + self.queue_limit
+
+    @property
+    def pending_count(self) -> int:
+        return self._pending_count
+
+    def reserve(self, job_count: int) -> None:
+        """
+        Reserve space for the given number of jobs.
+        :raises JobQueueFullError: when there is not enough space for all the
+        jobs
+        """
+        with self._lock:
+            if self._pending_count + job_count > self.capacity:
+                raise JobQueueFullError(
+                    f"Job queue is full, cannot accept {job_count} more "
+                    f"job(s). Pending jobs: {self._pending_count}/"
+                    f"{self.capacity}.")
+            self._pending_count += job_count
+
+    def release(self, job_count: int = 1) -> None:
+        with self._lock:
+            self._pending_count = max(0, self._pending_count - job_count)
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Submit a job for which space has already been reserved. The space is
+        given back if the job cannot be submitted.
+        """
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except Exception:
+            self.release()
+            raise
+
+        future.add_done_callback(lambda _: self.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
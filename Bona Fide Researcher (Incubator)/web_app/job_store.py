@@ -0,0 +1,213 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import json
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from enums.job_status import JobStatus
+
+DEFAULT_JOB_EXPIRY = 24 * 3600  # 1 day
+DEFAULT_MAX_SIZE_BYTES = 512 * 1024 * 1024
+# how many IDs of expired jobs are remembered to report them as EXPIRED
+DEFAULT_EXPIRED_JOB_IDS_LIMIT = 100_000
+
+FINISHED_JOB_STATUSES = {JobStatus.FINISHED_SUCCESS.name,
+                         JobStatus.FINISHED_ERROR.name}
+
+
+class JobStore(ABC):
+    """
+    Storage of the background jobs - their states and results.
+    """
+    @abstractmethod
+    def set(self, job_id: str, job_data: dict) -> None:
+        """
+        Create or replace the stored job.
+        :param job_id: ID of the job
+        :param job_data: status of the job and optionally its result
+        """
+        pass
+
+    @abstractmethod
+    def update(self, job_id: str, job_fields: dict) -> None:
+        """
+        Add or overwrite the given fields of an existing job.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> dict | None:
+        """
+        :returns: stored job data or None if the job is not (or no longer)
+        stored
+        """
+        pass
+
+    @abstractmethod
+    def is_expired(self, job_id: str) -> bool:
+        """
+        :returns: True if the job existed but was already evicted
+        """
+        pass
+
+    def get_status_data(self, job_id: str) -> dict:
+        """
+        :returns: job data, or just the EXPIRED/NOT_FOUND status for jobs
+        that are not stored
+        """
+        job_data = self.get(job_id)
+        if job_data is not None:
+            return job_data
+
+        if self.is_expired(job_id):
+            return {"status": JobStatus.EXPIRED.name}
+
+        return {"status": JobStatus.NOT_FOUND.name}
+
+
+class _StoredJob:
+    def __init__(self, job_data: dict, compress: bool):
+        self.is_finished = job_data.get("status") in FINISHED_JOB_STATUSES
+        self.finished_at = time.time() if self.is_finished else None
+        self.is_compressed = False
+        self.size = 0
+
+        # unfinished jobs are small and still change, store them as they are
+        if self.is_finished:
+            serialized_data = json.dumps(job_data).encode("utf-8")
+            if compress:
+                serialized_data = zlib.compress(serialized_data)
+                self.is_compressed = True
+            self.size = len(serialized_data)
+            self.data = serialized_data
+        else:
+            self.data = dict(job_data)
+
+    def get_data(self) -> dict:
+        if not self.is_finished:
+            return dict(self.data)
+
+        serialized_data = self.data
+        if self.is_compressed:
+            serialized_data = zlib.decompress(serialized_data)
+        return json.loads(serialized_data)
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Job store living in the process memory. Finished jobs are expired after
+    a TTL and the oldest finished jobs are evicted once their results exceed
+    the byte budget. Results of finished jobs are kept serialized
+    (optionally compressed), which also makes their size known.
+    """
+    def __init__(self, job_expiry: int = DEFAULT_JOB_EXPIRY,
+                 max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+                 compress_results: bool = True,
+                 expired_job_ids_limit: int = DEFAULT_EXPIRED_JOB_IDS_LIMIT):
+        self.job_expiry = job_expiry
+        self.max_size_bytes = max_size_bytes
+        self.compress_results = compress_results
+        self.expired_job_ids_limit = expired_job_ids_limit
+
+        self._lock = threading.Lock()
+        self._jobs = {}
+        # finished jobs in the order in which they finished (oldest first)
+        self._finished_job_ids = OrderedDict()
+        self._expired_job_ids = OrderedDict()
+        self._size_bytes = 0
+
+    def _remove(self, job_id: str) -> None:
+        stored_job = self._jobs.pop(job_id, None)
+        if stored_job is None:
+            return
+
+        if self._finished_job_ids.pop(job_id, None) is not None:
+            self._size_bytes -= stored_job.size
+
+    def _expire(self, job_id: str) -> None:
+        self._remove(job_id)
+        self._expired_job_ids[job_id] = True
+        while len(self._expired_job_ids) > self.expired_job_ids_limit:
+            self._expired_job_ids.popitem(last=False)
+
+    def _evict(self) -> None:
+        # expects the lock to be held by the caller
+        expiry_threshold = time.time() - self.job_expiry
+        while self._finished_job_ids:
+            oldest_job_id = next(iter(self._finished_job_ids))
+            oldest_job = self._jobs[oldest_job_id]
+            if (oldest_job.finished_at > expiry_threshold and
+                    self._size_bytes <= self.max_size_bytes):
+                break
+            self._expire(oldest_job_id)
+
+    def _store(self, job_id: str, stored_job: _StoredJob) -> None:
+        # expects the lock to be held by the caller
+        previous_job = self._jobs.get(job_id)
+        if (previous_job is not None and previous_job.is_finished and
+                stored_job.is_finished):
+            # updates of a finished job keep its place in the eviction
+            # order and do not prolong its lifetime
+            stored_job.finished_at = previous_job.finished_at
+            self._jobs[job_id] = stored_job
+            self._size_bytes += stored_job.size - previous_job.size
+        else:
+            self._remove(job_id)
+            self._expired_job_ids.pop(job_id, None)
+            self._jobs[job_id] = stored_job
+
+            if stored_job.is_finished:
+                self._finished_job_ids[job_id] = True
+                self._size_bytes += stored_job.size
+
+        self._evict()
+
+    def set(self, job_id: str, job_data: dict) -> None:
+        stored_job = _StoredJob(job_data, self.compress_results)
+
+        with self._lock:
+            self._store(job_id, stored_job)
+
+    def update(self, job_id: str, job_fields: dict) -> None:
+        # the job is read, merged and written back under the lock, so
+        # concurrent updates are not lost
+        with self._lock:
+            stored_job = self._jobs.get(job_id)
+            if stored_job is None:
+                return
+
+            job_data = stored_job.get_data()
+            job_data.update(job_fields)
+            self._store(job_id, _StoredJob(job_data, self.compress_results))
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            self._evict()
+            stored_job = self._jobs.get(job_id)
+
+        if stored_job is None:
+            return None
+
+        return stored_job.get_data()
+
+    def is_expired(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._expired_job_ids
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "finished_jobs": len(self._finished_job_ids),
+                "size_bytes": self._size_bytes,
+                "max_size_bytes": self.max_size_bytes,
+            }
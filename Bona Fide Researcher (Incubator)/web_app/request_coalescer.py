@@ -0,0 +1,112 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import threading
+from argparse import Namespace
+from typing import Hashable, List, Tuple
+
+from enums.job_status import JobStatus
+from utils.name_normalization import get_name_normalizer
+from web_app.job_store import JobStore
+
+
+def get_researcher_request_key(namespace_args: Namespace) -> Tuple:
+    """
+    Build a key identifying identical verification requests. Requests with
+    the same key produce the same result (callback URL is not part of it).
+    """
+    name_normalizer = get_name_normalizer()
+    given_name = name_normalizer.casefold(namespace_args.given_name)
+    surname = name_normalizer.casefold(namespace_args.surname)
+    names = (given_name, surname)
+    # given name and surname are interchangeable in this case
+    if namespace_args.uncertain_name_order:
+        names = tuple(sorted(names))
+
+    return (names,
+            name_normalizer.casefold(namespace_args.email),
+            name_normalizer.casefold(namespace_args.orcid),
+            name_normalizer.casefold(namespace_args.affiliation),
+            bool(namespace_args.uncertain_name_order),
+            bool(namespace_args.verbose),
+            bool(namespace_args.verify_email_domain),
+            namespace_args.limit_results,
+            namespace_args.limit_articles)
+
+
+class _InFlightJob:
+    def __init__(self, leader_job_id: str, status: str):
+        self.leader_job_id = leader_job_id
+        self.status = status
+        # [(job ID, callback URL), ...]
+        self.followers = []
+
+
+class RequestCoalescer:
+    """
+    Single-flight registry of running jobs. The first job with a given key
+    leads and does the work, jobs submitted with the same key while the
+    leader is in flight attach to it as followers and receive its result.
+    Statuses of the followers are written while holding the registry lock, so
+    they can never overwrite the final result delivered by the leader.
+    """
+    def __init__(self, jobs: JobStore):
+        self.jobs = jobs
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def _get_follower_job_data(self, in_flight_job: _InFlightJob) -> dict:
+        return {"status": in_flight_job.status,
+                "coalesced_with": in_flight_job.leader_job_id}
+
+    def attach(self, key: Hashable, job_id: str, callback_url: str) -> (
+            str | None):
+        """
+        Register a job under the given key.
+        :returns: ID of the leader job the job was attached to, None if the
+        job became the leader itself
+        """
+        with self._lock:
+            in_flight_job = self._in_flight.get(key)
+            if in_flight_job is None:
+                self._in_flight[key] = _InFlightJob(job_id,
+                                                    JobStatus.QUEUED.name)
+                return None
+
+            in_flight_job.followers.append((job_id, callback_url))
+            self.jobs.set(job_id, self._get_follower_job_data(in_flight_job))
+            return in_flight_job.leader_job_id
+
+    def set_status(self, key: Hashable, status: str) -> None:
+        """
+        Propagate the status of the leader job to all its followers.
+        """
+        with self._lock:
+            in_flight_job = self._in_flight.get(key)
+            if in_flight_job is None:
+                return
+
+            in_flight_job.status = status
+            for job_id, _ in in_flight_job.followers:
+                self.jobs.set(job_id,
+                              self._get_follower_job_data(in_flight_job))
+
+    def finish(self, key: Hashable) -> List[Tuple[str, str]]:
+        """
+        Remove the key from the registry, jobs submitted afterwards start a
+        new flight.
+        :returns: followers (job ID, callback URL) attached to the finished
+        leader job
+        """
+        with self._lock:
+            in_flight_job = self._in_flight.pop(key, None)
+
+        if in_flight_job is None:
+            return []
+
+        return in_flight_job.followers
@@ -0,0 +1,325 @@
+"""
+      |
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+
+from enums.job_status import JobStatus
+from web_app.job_store import (DEFAULT_EXPIRED_JOB_IDS_LIMIT,
+                               DEFAULT_JOB_EXPIRY, DEFAULT_MAX_SIZE_BYTES,
+                               FINISHED_JOB_STATUSES, JobStore)
+
+DEFAULT_JOB_STORE_FILEPATH = "./web_app/jobs.sqlite3"
+# every process using the store refreshes its heartbeat this often
+DEFAULT_OWNER_HEARTBEAT_INTERVAL = 30
+# unfinished jobs of a process without a heartbeat for this long are
+# considered orphaned (the process died) and are finished with an error
+DEFAULT_OWNER_TIMEOUT = 120
+# expired and orphaned jobs are cleaned up at most once per this interval
+DEFAULT_EVICTION_INTERVAL = 60
+
+
+class SqliteJobStore(JobStore):
+    """
+    Job store persisted in a local SQLite database. All the worker processes
+    of the web app share the same database file, so a job can be polled
+    through any of them, and the jobs survive restarts. Expiry and eviction
+    of finished jobs work the same way as in InMemoryJobStore, they are only
+    run from the writes (at most once per eviction interval), reads do not
+    write to the database.
+    Every job is owned by the process which wrote it last, the processes keep
+    heartbeats in the database. Unfinished jobs of a process without a
+    heartbeat for the owner timeout (the process died) are finished with an
+    error, then they expire as any other finished job. Late writes to such
+    orphaned jobs are dropped.
+    """
+    def __init__(self, filepath: str = DEFAULT_JOB_STORE_FILEPATH,
+                 job_expiry: int = DEFAULT_JOB_EXPIRY,
+                 max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+                 compress_results: bool = True,
+                 expired_job_ids_limit: int = DEFAULT_EXPIRED_JOB_IDS_LIMIT,
+                 owner_heartbeat_interval: int = (
+                         DEFAULT_OWNER_HEARTBEAT_INTERVAL),
+                 owner_timeout: int = DEFAULT_OWNER_TIMEOUT,
+                 eviction_interval: int = DEFAULT_EVICTION_INTERVAL):
+        self.filepath = filepath
+        self.job_expiry = job_expiry
+        self.max_size_bytes = max_size_bytes
+        self.compress_results = compress_results
+        self.expired_job_ids_limit = expired_job_ids_limit
+        self.owner_heartbeat_interval = owner_heartbeat_interval
+        self.owner_timeout = owner_timeout
+        self.eviction_interval = eviction_interval
+        # sqlite connections cannot be shared between threads safely
+        self._local = threading.local()
+        self._last_eviction_at = 0.0
+        # owner of the jobs written by this process (the store may be created
+        # before the worker processes are forked)
+        self._owner_lock = threading.Lock()
+        self._owner_id = None
+        self._owner_pid = None
+
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._get_connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, "
+                "status TEXT NOT NULL, "
+                "data BLOB NOT NULL, "
+                "is_compressed INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "finished_at REAL, "
+                "owner_id TEXT, "
+                "is_orphaned INTEGER NOT NULL DEFAULT 0)")
+            # databases created before the jobs were tracked for orphaning
+            columns = {row[1] for row in
+                       connection.execute("PRAGMA table_info(jobs)")}
+            if "owner_id" not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN owner_id TEXT")
+            if "is_orphaned" not in columns:
+                connection.execute(
+                    "ALTER TABLE jobs ADD COLUMN is_orphaned INTEGER NOT NULL "
+                    "DEFAULT 0")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS job_owners ("
+                "owner_id TEXT PRIMARY KEY, "
+                "pid INTEGER NOT NULL, "
+                "heartbeat_at REAL NOT NULL)")
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_finished_at "
+                "ON jobs (finished_at)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS expired_jobs ("
+                "job_id TEXT PRIMARY KEY, "
+                "expired_at REAL NOT NULL)")
+
+        # jobs orphaned while the app was not running are finished right away
+        connection = self._get_connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self._get_owner_id(connection)
+            self._evict(connection)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.filepath, timeout=30)
+            self._local.connection = connection
+
+        return connection
+
+    def _serialize(self, job_data: dict, is_finished: bool) -> (
+            tuple)[bytes, bool]:
+        serialized_data = json.dumps(job_data).encode("utf-8")
+        # unfinished jobs are small, only the results are worth compressing
+        if is_finished and self.compress_results:
+            return zlib.compress(serialized_data), True
+
+        return serialized_data, False
+
+    @staticmethod
+    def _deserialize(serialized_data: bytes, is_compressed: bool) -> dict:
+        if is_compressed:
+            serialized_data = zlib.decompress(serialized_data)
+        return json.loads(serialized_data)
+
+    def _get_owner_id(self, connection: sqlite3.Connection) -> str:
+        """
+        Register this process as an owner of the jobs if it is not yet (also
+        after a fork) and start its heartbeat.
+        :returns: owner ID of this process
+        """
+        with self._owner_lock:
+            pid = os.getpid()
+            if self._owner_pid != pid:
+                owner_id = uuid.uuid4().hex
+                connection.execute(
+                    "INSERT OR REPLACE INTO job_owners "
+                    "(owner_id, pid, heartbeat_at) VALUES (?, ?, ?)",
+                    (owner_id, pid, time.time()))
+                self._owner_id = owner_id
+                self._owner_pid = pid
+                threading.Thread(target=self._beat, args=(owner_id, pid),
+                                 name="job-store-heartbeat",
+                                 daemon=True).start()
+
+            return self._owner_id
+
+    def _beat(self, owner_id: str, pid: int) -> None:
+        while self._owner_pid == pid:
+            time.sleep(self.owner_heartbeat_interval)
+            try:
+                connection = self._get_connection()
+                with connection:
+                    # re-registers the owner if it was considered gone
+                    connection.execute(
+                        "INSERT OR REPLACE INTO job_owners "
+                        "(owner_id, pid, heartbeat_at) VALUES (?, ?, ?)",
+                        (owner_id, pid, time.time()))
+            except sqlite3.Error as e:
+                print(f"Job store heartbeat failed: {e}")
+
+    def _finish_orphaned(self, connection: sqlite3.Connection,
+                         now: float) -> None:
+        serialized_data, is_compressed = self._serialize(
+            {"status": JobStatus.FINISHED_ERROR.name,
+             "error_message": "The job was interrupted, please submit it "
+                              "again."}, True)
+        live_owner_threshold = now - self.owner_timeout
+        # jobs without an owner were written before the owners were tracked
+        connection.execute(
+            "UPDATE jobs SET status = ?, data = ?, is_compressed = ?, "
+            "size = ?, finished_at = ?, owner_id = NULL, is_orphaned = 1 "
+            "WHERE finished_at IS NULL AND (owner_id IS NULL OR owner_id "
+            "NOT IN (SELECT owner_id FROM job_owners WHERE heartbeat_at > ?))",
+            (JobStatus.FINISHED_ERROR.name, serialized_data,
+             int(is_compressed), len(serialized_data), now,
+             live_owner_threshold))
+        connection.execute("DELETE FROM job_owners WHERE heartbeat_at <= ?",
+                           (live_owner_threshold,))
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        # expects a write transaction to be open
+        now = time.time()
+        self._last_eviction_at = now
+        self._finish_orphaned(connection, now)
+
+        expired_rows = connection.execute(
+            "SELECT job_id FROM jobs "
+            "WHERE finished_at IS NOT NULL AND finished_at <= ?",
+            (now - self.job_expiry,)).fetchall()
+
+        total_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM jobs "
+            "WHERE finished_at IS NOT NULL AND finished_at > ?",
+            (now - self.job_expiry,)).fetchone()[0]
+        if total_size > self.max_size_bytes:
+            # the oldest finished jobs go first
+            rows = connection.execute(
+                "SELECT job_id, size FROM jobs "
+                "WHERE finished_at IS NOT NULL AND finished_at > ? "
+                "ORDER BY finished_at ASC", (now - self.job_expiry,))
+            for job_id, size in rows.fetchall():
+                if total_size <= self.max_size_bytes:
+                    break
+                expired_rows.append((job_id,))
+                total_size -= size
+
+        if not expired_rows:
+            return
+
+        connection.executemany("DELETE FROM jobs WHERE job_id = ?",
+                               expired_rows)
+        connection.executemany(
+            "INSERT OR REPLACE INTO expired_jobs (job_id, expired_at) "
+            "VALUES (?, ?)", [(job_id, now) for job_id, in expired_rows])
+        connection.execute(
+            "DELETE FROM expired_jobs WHERE job_id NOT IN ("
+            "SELECT job_id FROM expired_jobs "
+            "ORDER BY expired_at DESC LIMIT ?)",
+            (self.expired_job_ids_limit,))
+
+    def _write(self, connection: sqlite3.Connection, job_id: str,
+               job_data: dict) -> None:
+        # expects a write transaction to be open
+        status = job_data.get("status")
+        is_finished = status in FINISHED_JOB_STATUSES
+        serialized_data, is_compressed = self._serialize(job_data,
+                                                         is_finished)
+        now = time.time()
+
+        row = connection.execute(
+            "SELECT finished_at, is_orphaned FROM jobs WHERE job_id = ?",
+            (job_id,)).fetchone()
+        if row and row[1]:
+            # the client has already been told the job was interrupted
+            print(f"Job {job_id} was finished as interrupted, its late "
+                  f"{status} update is dropped.")
+            return
+
+        finished_at = None
+        if is_finished:
+            # updates of a finished job do not prolong its lifetime
+            finished_at = row[0] if row and row[0] else now
+
+        connection.execute(
+            "INSERT OR REPLACE INTO jobs "
+            "(job_id, status, data, is_compressed, size, finished_at, "
+            "owner_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, status, serialized_data, int(is_compressed),
+             len(serialized_data), finished_at,
+             self._get_owner_id(connection)))
+        connection.execute("DELETE FROM expired_jobs WHERE job_id = ?",
+                           (job_id,))
+
+        if now - self._last_eviction_at >= self.eviction_interval:
+            self._evict(connection)
+
+    def set(self, job_id: str, job_data: dict) -> None:
+        connection = self._get_connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self._write(connection, job_id, job_data)
+
+    def update(self, job_id: str, job_fields: dict) -> None:
+        connection = self._get_connection()
+        # the job is read and written back in a single transaction, so
+        # concurrent updates from other processes are not lost
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT data, is_compressed FROM jobs WHERE job_id = ?",
+                (job_id,)).fetchone()
+            if row is None:
+                return
+
+            serialized_data, is_compressed = row
+            job_data = self._deserialize(serialized_data, bool(is_compressed))
+            job_data.update(job_fields)
+            self._write(connection, job_id, job_data)
+
+    def get(self, job_id: str) -> dict | None:
+        # jobs past their expiry which have not been evicted yet are skipped
+        row = self._get_connection().execute(
+            "SELECT data, is_compressed FROM jobs "
+            "WHERE job_id = ? AND (finished_at IS NULL OR finished_at > ?)",
+            (job_id, time.time() - self.job_expiry)).fetchone()
+
+        if row is None:
+            return None
+
+        serialized_data, is_compressed = row
+        return self._deserialize(serialized_data, bool(is_compressed))
+
+    def is_expired(self, job_id: str) -> bool:
+        row = self._get_connection().execute(
+            "SELECT 1 FROM expired_jobs WHERE job_id = ? UNION ALL "
+            "SELECT 1 FROM jobs WHERE job_id = ? AND finished_at <= ?",
+            (job_id, job_id, time.time() - self.job_expiry)).fetchone()
+        return row is not None
+
+    def get_stats(self) -> dict:
+        jobs, finished_jobs, size = self._get_connection().execute(
+            "SELECT COUNT(*), COUNT(finished_at), "
+            "COALESCE(SUM(CASE WHEN finished_at IS NOT NULL THEN size END), 0)"
+            " FROM jobs").fetchone()
+        return {
+            "jobs": jobs,
+            "finished_jobs": finished_jobs,
+            "size_bytes": size,
+            "max_size_bytes": self.max_size_bytes,
+        }